@@ -61,7 +61,6 @@ async def login(
         if not form_data.client_secret: # We use client_secret field for MFA code
             # Generate and send code
             from backend.services.email_service import EmailService
-            from backend.services.email_service import EmailService
             
             code = EmailService.generate_code()
             # Seguridad A02: Encriptar código MFA antes de guardar
@@ -69,7 +68,7 @@ async def login(
             user.mfa_code_expires_at = datetime.utcnow() + timedelta(minutes=5)
             db.commit()
             
-            EmailService.send_mfa_code(user.email, code)
+            await EmailService.send_mfa_code(user.email, code)
             
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -2,9 +2,14 @@
 FastAPI router for calibration endpoints.
 Handles CRUD operations, image uploads, robot poses, and calibration execution.
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter
+import orjson
+import numpy as np
+from typing import List, Optional, Tuple, Type
 from pathlib import Path
 from datetime import datetime
 
@@ -24,8 +29,8 @@ from backend.schemas.calibration import (
 )
 from backend.auth.dependencies import get_current_active_user, require_engineer
 from backend.utils.file_utils import (
-    validate_image_file,
-    save_uploaded_image,
+    POSE_FIELDS,
+    save_many,
     parse_robot_poses_csv,
     get_image_dimensions
 )
@@ -33,10 +38,46 @@ from backend.config import settings
 from backend.calibration import CalibrationService
 from backend.calibration.transformations import euler_to_rotation_matrix
 from backend.services.export_service import ExportService
+from backend.utils.charuco_detector import detect_and_annotate_batch
 from fastapi.responses import Response
 
 router = APIRouter()
 
+# Validators for list endpoints, built once per schema
+ROBOT_POSE_LIST_ADAPTER = TypeAdapter(List[RobotPoseResponse])
+IMAGE_LIST_ADAPTER = TypeAdapter(List[CalibrationImageResponse])
+CAMERA_POSE_LIST_ADAPTER = TypeAdapter(List[CameraPoseResponse])
+
+
+@lru_cache(maxsize=None)
+def _schema_fields(schema_cls: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(schema_cls.model_fields)
+
+
+def orm_to_schema(row, schema_cls: Type[BaseModel]) -> BaseModel:
+    """
+    Build a response model from an ORM row we just loaded (trusted data) with
+    model_construct, skipping validation. Arrays are converted to lists, which is
+    the only conversion the response validators would otherwise do.
+    Read paths only: input payloads keep going through model_validate.
+    """
+    values = {}
+    for name in _schema_fields(schema_cls):
+        value = getattr(row, name)
+        values[name] = value.tolist() if isinstance(value, np.ndarray) else value
+    return schema_cls.model_construct(**values)
+
+
+def _list_response(adapter: TypeAdapter, schema_cls: Type[BaseModel], rows: list) -> Response:
+    """
+    Serialize trusted ORM rows straight to JSON.
+    Returning models would make FastAPI dump and re-validate every item again.
+    """
+    return Response(
+        content=adapter.dump_json([orm_to_schema(row, schema_cls) for row in rows]),
+        media_type="application/json"
+    )
+
 
 # ============================================================================
 # CRUD Operations for Calibrations
@@ -98,19 +139,23 @@ def list_calibrations(
     
     All users can see all calibrations (shared workspace).
     """
-    query = db.query(CalibrationRun)
+    # Read view: plain Core rows (no ORM objects, no model validation) serialized with orjson
+    stmt = select(*CalibrationRun.__table__.columns)
     
     # Filter by status if provided
     if status:
-        query = query.filter(CalibrationRun.status == status)
+        stmt = stmt.where(CalibrationRun.status == status)
     
     # Seguridad A01: Control de Acceso (IDOR) - Filtrar por usuario a menos que sea Admin/Supervisor
     # Engineers and Supervisors can see all, Technicians only their own
     if current_user.role.value not in ["engineer", "supervisor"]:
-        query = query.filter(CalibrationRun.user_id == current_user.id)
+        stmt = stmt.where(CalibrationRun.user_id == current_user.id)
     
-    calibrations = query.offset(skip).limit(limit).all()
-    return calibrations
+    rows = db.execute(stmt.offset(skip).limit(limit)).all()
+    return Response(
+        content=orjson.dumps([CalibrationRunResponse.from_row(row) for row in rows]),
+        media_type="application/json"
+    )
 
 
 @router.get("/calibrations/{calibration_id}", response_model=CalibrationRunResponse)
@@ -120,7 +165,7 @@ def get_calibration(
     current_user: User = Depends(get_current_active_user)
 ):
     """Get detailed information about a specific calibration run."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
@@ -130,7 +175,10 @@ def get_calibration(
     if calibration.user_id != current_user.id and current_user.role.value not in ["engineer", "supervisor"]:
         raise HTTPException(status_code=403, detail="Not authorized to view this calibration")
     
-    return calibration
+    return Response(
+        content=orm_to_schema(calibration, CalibrationRunResponse).model_dump_json(),
+        media_type="application/json"
+    )
 
 
 @router.delete("/calibrations/{calibration_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -140,14 +188,18 @@ def delete_calibration(
     current_user: User = Depends(require_engineer)
 ):
     """Delete a calibration run. Only engineers can delete."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    # The delete cascade walks every child collection; load them in batched IN queries
+    calibration = db.query(CalibrationRun).options(
+        selectinload(CalibrationRun.robot_poses),
+        selectinload(CalibrationRun.camera_poses),
+        selectinload(CalibrationRun.images)
+    ).filter(CalibrationRun.id == calibration_id).first()
     
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
     # Delete associated images from disk
-    images = db.query(CalibrationImage).filter(CalibrationImage.calibration_run_id == calibration_id).all()
-    for img in images:
+    for img in calibration.images:
         try:
             Path(img.image_path).unlink(missing_ok=True)
         except:
@@ -164,7 +216,10 @@ def get_calibration_report(
     current_user: User = Depends(get_current_active_user)
 ):
     """Generate and download PDF report."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    # The report shows the creator's username; fetch it in the same query
+    calibration = db.query(CalibrationRun).options(
+        joinedload(CalibrationRun.user)
+    ).filter(CalibrationRun.id == calibration_id).first()
     
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
@@ -193,6 +248,7 @@ def get_calibration_report(
 @router.post("/calibrations/{calibration_id}/upload-images", response_model=ImageUploadResponse)
 async def upload_images(
     calibration_id: int,
+    request: Request,
     files: List[UploadFile] = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
@@ -205,7 +261,7 @@ async def upload_images(
     - Images are saved with structured filenames
     """
     # Verify calibration exists and user has permission
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
@@ -222,58 +278,47 @@ async def upload_images(
     uploaded_filenames = []
     errors = []
     
-    # Get next pose_index
-    existing_count = db.query(CalibrationImage).filter(
-        CalibrationImage.calibration_run_id == calibration_id
-    ).count()
+    image_rows = []
+    
+    # Next pose_index follows the highest stored one (rejected files leave gaps, so a
+    # count would reuse an index and collide with the unique (run, pose_index) index)
+    last_pose_index = db.scalar(
+        select(func.max(CalibrationImage.pose_index))
+        .where(CalibrationImage.calibration_run_id == calibration_id)
+    ) or 0
+    
+    # Save every file first, then run all detections concurrently
+    saved_images = []
+    detection_jobs = []
+    annotated_dir = Path(settings.UPLOAD_DIR) / f"calibration_{calibration_id}" / "annotated"
+    
+    # Validate and save all files concurrently (bounded by settings.UPLOAD_CONCURRENCY)
+    saved_paths = await save_many(files, calibration_id, last_pose_index + 1)
     
-    for idx, file in enumerate(files, start=existing_count + 1):
+    for idx, (file, saved_path) in enumerate(zip(files, saved_paths), start=last_pose_index + 1):
         try:
-            # Validate file
-            validate_image_file(file)
-            
-            # Save file
-            saved_path = await save_uploaded_image(file, calibration_id, idx)
+            # Rejected or failed save: report it like any other per-file error
+            if isinstance(saved_path, Exception):
+                raise saved_path
             
             # Get image dimensions
             width, height = get_image_dimensions(saved_path)
             
-            # Detect ChArUco and create annotated image
-            from backend.utils.charuco_detector import detect_and_annotate_charuco
-            from pathlib import Path
-            
-            annotated_dir = Path(settings.UPLOAD_DIR) / f"calibration_{calibration_id}" / "annotated"
-            annotated_path = annotated_dir / f"img_{idx:02d}_annotated{Path(file.filename).suffix}"
-            
-            detected, corners_count, ids_count, corners_data, ids_data = detect_and_annotate_charuco(
-                image_path=saved_path,
-                output_path=annotated_path,
-                squares_x=calibration.charuco_squares_x,
-                squares_y=calibration.charuco_squares_y,
-                square_length=calibration.charuco_square_length,
-                marker_length=calibration.charuco_marker_length,
-                dictionary_name=calibration.charuco_dictionary
-            )
-            
-            # Create database record
-            calib_image = CalibrationImage(
-                calibration_run_id=calibration_id,
-                pose_index=idx,
-                image_path=str(saved_path),
-                annotated_image_path=str(annotated_path) if annotated_path.exists() else None,
-                original_filename=file.filename,
-                file_size_bytes=saved_path.stat().st_size if saved_path.exists() else 0,
-                image_width=width,
-                image_height=height,
-                charuco_detected=detected,
-                corners_detected=corners_count,
-                ids_detected=ids_count,
-                charuco_corners=corners_data,
-                charuco_ids=ids_data
-            )
-            
-            db.add(calib_image)
-            uploaded_filenames.append(file.filename)
+            # Annotated copies are previews only: always JPEG, whatever the upload format
+            annotated_path = annotated_dir / f"img_{idx:02d}_annotated.jpg"
+            thumbnail_path = annotated_dir / f"img_{idx:02d}_thumb.jpg"
+            saved_images.append((idx, file.filename, saved_path, annotated_path, thumbnail_path, width, height))
+            detection_jobs.append({
+                'image_path': saved_path,
+                'output_path': annotated_path,
+                'thumbnail_path': thumbnail_path,
+                'squares_x': calibration.charuco_squares_x,
+                'squares_y': calibration.charuco_squares_y,
+                'square_length': calibration.charuco_square_length,
+                'marker_length': calibration.charuco_marker_length,
+                'dictionary_name': calibration.charuco_dictionary,
+                'image_size': (width, height)
+            })
             
         except HTTPException as e:
             import logging
@@ -288,6 +333,40 @@ async def upload_images(
             logger.error(traceback.format_exc())
             errors.append(f"{file.filename}: {str(e)}")
     
+    # Detect ChArUco and create annotated images.
+    # Detection is CPU-bound: fan it out over the process pool to keep the event loop free
+    detections = await detect_and_annotate_batch(request.app.state.exec_pool, detection_jobs)
+    
+    for (idx, filename, saved_path, annotated_path, thumbnail_path, width, height), detection in zip(saved_images, detections):
+        if isinstance(detection, BaseException):
+            import logging
+            logger = logging.getLogger(__name__)
+            logger.error(f"Exception detecting ChArUco in {filename}: {detection!r}")
+            errors.append(f"{filename}: {detection}")
+            continue
+        detected, corners_count, ids_count, corners_data, ids_data = detection
+        
+        # Database record (inserted together with the rest of the batch below)
+        image_rows.append({
+            'calibration_run_id': calibration_id,
+            'pose_index': idx,
+            'image_path': str(saved_path),
+            'annotated_image_path': str(annotated_path) if annotated_path.exists() else None,
+            'thumbnail_path': str(thumbnail_path) if thumbnail_path.exists() else None,
+            'original_filename': filename,
+            'file_size_bytes': saved_path.stat().st_size if saved_path.exists() else 0,
+            'image_width': width,
+            'image_height': height,
+            'charuco_detected': detected,
+            'corners_detected': corners_count,
+            'ids_detected': ids_count,
+            'charuco_corners': corners_data,
+            'charuco_ids': ids_data
+        })
+        uploaded_filenames.append(filename)
+    
+    if image_rows:
+        CalibrationImage.bulk_insert(db, image_rows)
     db.commit()
     
     return ImageUploadResponse(
@@ -310,7 +389,7 @@ def add_robot_pose(
     current_user: User = Depends(get_current_active_user)
 ):
     """Add a single robot pose manually."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
@@ -336,7 +415,7 @@ def add_robot_pose(
         ry=pose.ry,
         rz=pose.rz,
         input_method=RobotPoseInputMethod.MANUAL_ENTRY,
-        rotation_matrix=euler_to_rotation_matrix(pose.rx, pose.ry, pose.rz, degrees=True).tolist(),
+        rotation_matrix=euler_to_rotation_matrix(pose.rx, pose.ry, pose.rz, degrees=True),
         translation_vector=[pose.x, pose.y, pose.z]
     )
     
@@ -362,7 +441,7 @@ async def import_robot_poses_csv(
     current_user: User = Depends(get_current_active_user)
 ):
     """Import robot poses from CSV file."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
@@ -377,49 +456,36 @@ async def import_robot_poses_csv(
         raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
     
     errors = []
-    imported_count = 0
+    new_poses = []
+    
+    # Existing pose indices in one query instead of one lookup per CSV row
+    existing_indices = set(db.execute(
+        select(RobotPose.pose_index).where(RobotPose.calibration_run_id == calibration_id)
+    ).scalars())
     
+    # Validate each pose before the batch insert so one bad row is reported and skipped
     for pose_data in poses:
+        pose_index = pose_data.get('pose_index')
+        if pose_index in existing_indices:
+            errors.append(f"Pose {pose_index} already exists, skipping")
+            continue
+        
         try:
-            # Check if pose_index already exists
-            existing = db.query(RobotPose).filter(
-                RobotPose.calibration_run_id == calibration_id,
-                RobotPose.pose_index == pose_data['pose_index']
-            ).first()
-            
-            if existing:
-                errors.append(f"Pose {pose_data['pose_index']} already exists, skipping")
-                continue
-            
-            # Calculate matrices
-            try:
-                rot_mat = euler_to_rotation_matrix(pose_data['rx'], pose_data['ry'], pose_data['rz'], degrees=True).tolist()
-                trans_vec = [pose_data['x'], pose_data['y'], pose_data['z']]
-            except Exception as e:
-                errors.append(f"Error calculating matrices for pose {pose_data['pose_index']}: {str(e)}")
-                continue
-
-            robot_pose = RobotPose(
-                calibration_run_id=calibration_id,
-                pose_index=pose_data['pose_index'],
-                x=pose_data['x'],
-                y=pose_data['y'],
-                z=pose_data['z'],
-                rx=pose_data['rx'],
-                ry=pose_data['ry'],
-                rz=pose_data['rz'],
-                input_method=RobotPoseInputMethod.CSV_IMPORT,
-                rotation_matrix=rot_mat,
-                translation_vector=trans_vec
-            )
-            db.add(robot_pose)
-            imported_count += 1
-            
-        except Exception as e:
-            errors.append(f"Pose {pose_data.get('pose_index')}: {str(e)}")
+            values = [float(pose_data[field]) for field in POSE_FIELDS]
+        except (KeyError, TypeError, ValueError) as e:
+            errors.append(f"Pose {pose_index}: {str(e)}")
+            continue
+        
+        if not np.all(np.isfinite(values)):
+            errors.append(f"Error calculating matrices for pose {pose_index}: non-finite value")
+            continue
+        
+        existing_indices.add(pose_index)
+        new_poses.append(pose_data)
     
-    # Update calibration metadata
+    # Insert all new poses and update calibration metadata in a single transaction
     try:
+        imported_count = RobotPose.bulk_from_csv(db, calibration_id, new_poses)
         calibration.robot_poses_input_method = RobotPoseInputMethod.CSV_IMPORT
         calibration.csv_filename = file.filename
         db.commit()
@@ -442,7 +508,7 @@ def list_robot_poses(
     current_user: User = Depends(get_current_active_user)
 ):
     """List all robot poses for a calibration."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
@@ -450,7 +516,7 @@ def list_robot_poses(
         RobotPose.calibration_run_id == calibration_id
     ).order_by(RobotPose.pose_index).all()
     
-    return poses
+    return _list_response(ROBOT_POSE_LIST_ADAPTER, RobotPoseResponse, poses)
 
 
 # ============================================================================
@@ -471,7 +537,7 @@ def execute_calibration(
     """
     print(f"🚀 Executing calibration {calibration_id}")
     
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         print(f"❌ Calibration {calibration_id} not found")
         raise HTTPException(status_code=404, detail="Calibration not found")
@@ -515,6 +581,8 @@ def execute_calibration(
     try:
         print(f"⚙️  Starting calibration service")
         service = CalibrationService(db)
+        # Sync route: FastAPI runs the whole handler (DB queries included) in its
+        # threadpool, so the CPU-bound solve never blocks the event loop
         result = service.process_calibration_run(calibration_id)
         
         print(f"📊 Service result: {result}")
@@ -529,7 +597,8 @@ def execute_calibration(
                 translation_error_mm=result.get('translation_error_mm'),
                 poses_processed=result['poses_processed'],
                 poses_valid=result['poses_valid'],
-                method=result.get('method')
+                method=result.get('method'),
+                calibration=orm_to_schema(calibration, CalibrationRunResponse)
             )
         else:
             # Rollback status to pending on failure
@@ -580,7 +649,7 @@ def list_images(
     current_user: User = Depends(get_current_active_user)
 ):
     """List all images for a calibration with detection status."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
@@ -588,7 +657,7 @@ def list_images(
         CalibrationImage.calibration_run_id == calibration_id
     ).order_by(CalibrationImage.pose_index).all()
     
-    return images
+    return _list_response(IMAGE_LIST_ADAPTER, CalibrationImageResponse, images)
 
 
 @router.get("/calibrations/{calibration_id}/camera-poses", response_model=List[CameraPoseResponse])
@@ -598,14 +667,14 @@ def list_camera_poses(
     current_user: User = Depends(get_current_active_user)
 ):
     """List all computed camera poses for a calibration."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
     camera_poses = db.query(CameraPose).filter(
         CameraPose.calibration_run_id == calibration_id
     ).order_by(CameraPose.pose_index).all()
-    return camera_poses
+    return _list_response(CAMERA_POSE_LIST_ADAPTER, CameraPoseResponse, camera_poses)
 
 
 # ============================================================================
@@ -619,7 +688,7 @@ def export_json(
     current_user: User = Depends(get_current_active_user)
 ):
     """Export calibration results as JSON."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
@@ -641,7 +710,7 @@ def export_csv(
     current_user: User = Depends(get_current_active_user)
 ):
     """Export calibration transformation matrix as CSV."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
@@ -663,7 +732,7 @@ def export_txt(
     current_user: User = Depends(get_current_active_user)
 ):
     """Export calibration results as human-readable text."""
-    calibration = db.query(CalibrationRun).filter(CalibrationRun.id == calibration_id).first()
+    calibration = db.get(CalibrationRun, calibration_id)
     if not calibration:
         raise HTTPException(status_code=404, detail="Calibration not found")
     
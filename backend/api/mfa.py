@@ -36,7 +36,7 @@ async def enable_mfa(
             detail="MFA code expired"
         )
         
-    if verification.code != current_user.mfa_code:
+    if verification.code != current_user.get_mfa_code():
          raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid MFA code"
@@ -58,11 +58,11 @@ async def generate_mfa_code(
     from datetime import timedelta
     
     code = EmailService.generate_code()
-    current_user.mfa_code = code
+    current_user.set_mfa_code(code)
     current_user.mfa_code_expires_at = datetime.utcnow() + timedelta(minutes=5)
     db.commit()
     
-    EmailService.send_mfa_code(current_user.email, code)
+    await EmailService.send_mfa_code(current_user.email, code)
     return {"message": "MFA code sent"}
 
 @router.post("/disable")
@@ -4,6 +4,7 @@ Provides ChArUco detection, pose estimation, and hand-eye calibration algorithms
 """
 from .transformations import (
     euler_to_rotation_matrix,
+    euler_deg_to_matrices,
     rotation_matrix_to_euler,
     create_homogeneous_matrix,
     matrix_to_rotation_translation,
@@ -28,13 +29,16 @@ from .error_metrics import (
     calculate_reprojection_error,
     calculate_rotation_error,
     calculate_translation_error,
-    calculate_pose_diversity
+    calculate_pose_diversity,
+    target_base_transforms,
+    translation_residual
 )
 from .calibration_service import CalibrationService
 
 __all__ = [
     # Transformations
     "euler_to_rotation_matrix",
+    "euler_deg_to_matrices",
     "rotation_matrix_to_euler",
     "create_homogeneous_matrix",
     "matrix_to_rotation_translation",
@@ -58,6 +62,8 @@ __all__ = [
     "calculate_rotation_error",
     "calculate_translation_error",
     "calculate_pose_diversity",
+    "target_base_transforms",
+    "translation_residual",
     # Calibration service
     "CalibrationService"
 ]
@@ -2,18 +2,20 @@
 Calibration service that orchestrates the complete hand-eye calibration process.
 Processes images, detects ChArUco boards, estimates poses, and runs calibration algorithm.
 """
+import os
+import threading
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
-from datetime import datetime
 
 from backend.models import CalibrationRun, CalibrationImage, RobotPose, CameraPose
 from backend.models.calibration import CalibrationStatus
 from backend.calibration.charuco_detector import ChArUcoDetector
 from backend.calibration.camera_params import get_default_camera_matrix, get_default_distortion_coeffs
-from backend.calibration.transformations import pose_euler_to_matrix
 from backend.calibration.tsai_lenz import solve_hand_eye_tsai_lenz, validate_pose_pairs
 from backend.calibration.error_metrics import calculate_reprojection_error, calculate_pose_diversity
 
@@ -59,9 +61,8 @@ class CalibrationService:
         """
         try:
             # Load calibration run
-            calib_run = self.db.query(CalibrationRun).filter(
-                CalibrationRun.id == calibration_run_id
-            ).first()
+            # Identity-map lookup: the endpoint already loaded this run in the same session
+            calib_run = self.db.get(CalibrationRun, calibration_run_id)
             
             if not calib_run:
                 return {
@@ -79,37 +80,19 @@ class CalibrationService:
             )
             
             # Get camera parameters - use stored values if available, otherwise defaults
-            if (calib_run.camera_fx is not None and 
-                calib_run.camera_fy is not None and
-                calib_run.camera_cx is not None and
-                calib_run.camera_cy is not None):
+            camera_matrix, dist_coeffs = calib_run.camera_intrinsics
+            if camera_matrix is not None:
                 # Use stored camera intrinsic parameters
-                camera_matrix = np.array([
-                    [calib_run.camera_fx, 0, calib_run.camera_cx],
-                    [0, calib_run.camera_fy, calib_run.camera_cy],
-                    [0, 0, 1]
-                ], dtype=np.float64)
-                print(f"✓ Using calibration-specific camera matrix (fx={calib_run.camera_fx:.2f}, fy={calib_run.camera_fy:.2f})")
+                print(f"✓ Using calibration-specific camera matrix (fx={camera_matrix[0, 0]:.2f}, fy={camera_matrix[1, 1]:.2f})")
             else:
                 # Use defaults
                 camera_matrix = get_default_camera_matrix()
                 print("⚠ Using default camera matrix (no calibration-specific parameters provided)")
             
             # Get distortion coefficients - use stored values if available
-            if (calib_run.camera_k1 is not None and
-                calib_run.camera_k2 is not None and
-                calib_run.camera_p1 is not None and
-                calib_run.camera_p2 is not None and
-                calib_run.camera_k3 is not None):
+            if dist_coeffs is not None:
                 # Use stored distortion coefficients
-                dist_coeffs = np.array([
-                    calib_run.camera_k1,
-                    calib_run.camera_k2,
-                    calib_run.camera_p1,
-                    calib_run.camera_p2,
-                    calib_run.camera_k3
-                ], dtype=np.float64)
-                print(f"✓ Using calibration-specific distortion coefficients (k1={calib_run.camera_k1:.4f})")
+                print(f"✓ Using calibration-specific distortion coefficients (k1={dist_coeffs[0]:.4f})")
             else:
                 # Use defaults
                 dist_coeffs = get_default_distortion_coeffs()
@@ -147,7 +130,9 @@ class CalibrationService:
                     'error_message': f"Pose validation failed: {'; '.join(validation['errors'])}"
                 }
             
-            # Run calibration algorithm
+            # Run calibration algorithm. This runs on a threadpool worker (the execute route
+            # is a sync handler) and cv2.calibrateHandEye releases the GIL, so concurrent
+            # calibrations solve in parallel without pickling poses to a process pool.
             calib_result = solve_hand_eye_tsai_lenz(robot_poses_matrices, camera_poses_matrices)
             
             # Calculate errors
@@ -183,9 +168,8 @@ class CalibrationService:
             
         except Exception as e:
             # Mark calibration as failed
-            calib_run = self.db.query(CalibrationRun).filter(
-                CalibrationRun.id == calibration_run_id
-            ).first()
+            # Identity-map lookup: the endpoint already loaded this run in the same session
+            calib_run = self.db.get(CalibrationRun, calibration_run_id)
             
             if calib_run:
                 calib_run.status = CalibrationStatus.FAILED
@@ -217,51 +201,90 @@ class CalibrationService:
             }
         
         camera_poses = []
+        camera_pose_rows = []
+        detected_images = []
         successful_count = 0
         
-        for calib_image in images:
-            # Read image from disk
-            image_path = Path(calib_image.image_path)
-            
-            if not image_path.exists():
+        # OpenCV detector objects are not documented as safe for concurrent use,
+        # so each worker thread builds its own copy of `detector` on first use
+        thread_state = threading.local()
+        
+        def thread_detector() -> ChArUcoDetector:
+            if not hasattr(thread_state, 'detector'):
+                thread_state.detector = ChArUcoDetector(
+                    squares_x=detector.squares_x,
+                    squares_y=detector.squares_y,
+                    square_length=detector.square_length,
+                    marker_length=detector.marker_length,
+                    dictionary_name=detector.dictionary_name
+                )
+            return thread_state.detector
+        
+        def estimate_image_pose(image_path: Path) -> Optional[Dict]:
+            # Decode + detect + solvePnP; OpenCV releases the GIL, so images run in parallel threads.
+            # One read of the bytes, decoded from memory (no extra stat, Unicode-safe paths).
+            # Unreadable, vanished or empty files are skipped like cv2.imread's None
+            try:
+                image = cv2.imdecode(np.fromfile(image_path, dtype=np.uint8), cv2.IMREAD_COLOR)
+            except (OSError, cv2.error):
+                return None
+            if image is None:
+                return None
+            return thread_detector().estimate_pose(image, camera_matrix, dist_coeffs)
+        
+        image_paths = [Path(calib_image.image_path) for calib_image in images]
+        
+        # One directory listing per image folder instead of one stat per image
+        on_disk = set()
+        for image_dir in {image_path.parent for image_path in image_paths}:
+            try:
+                with os.scandir(image_dir) as entries:
+                    on_disk.update(Path(entry.path) for entry in entries if entry.is_file())
+            except FileNotFoundError:
+                pass
+        
+        existing = []
+        for calib_image, image_path in zip(images, image_paths):
+            if image_path not in on_disk:
                 print(f"Warning: Image not found: {image_path}")
                 continue
-            
-            image = cv2.imread(str(image_path))
-            
-            if image is None:
+            existing.append((calib_image, image_path))
+        
+        # Only image paths cross into the workers; ORM objects are updated here, in pose order
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            pose_results = list(pool.map(estimate_image_pose, [path for _, path in existing]))
+        
+        for (calib_image, image_path), pose_result in zip(existing, pose_results):
+            if pose_result is None:
                 print(f"Warning: Could not read image: {image_path}")
                 continue
             
-            # Estimate pose
-            pose_result = detector.estimate_pose(image, camera_matrix, dist_coeffs)
-            
             # Update CalibrationImage with detection results
             calib_image.charuco_detected = pose_result['success']
             calib_image.corners_detected = pose_result['corners_detected']
             
             if pose_result['success']:
-                # Create CameraPose in database
-                camera_pose = CameraPose(
-                    calibration_run_id=calib_run.id,
-                    pose_index=calib_image.pose_index,
-                    rotation_matrix=pose_result['rotation_matrix'].tolist(),
-                    translation_vector=pose_result['tvec'].ravel().tolist(),
-                    computed_automatically=True,
-                    reprojection_error_individual=pose_result['reprojection_error'],
-                    computed_at=datetime.utcnow()
-                )
-                
-                self.db.add(camera_pose)
-                self.db.flush()  # Get the ID
-                
-                # Link image to camera pose
-                calib_image.camera_pose_id = camera_pose.id
+                # CameraPose row (inserted together with the rest after the loop)
+                camera_pose_rows.append({
+                    'calibration_run_id': calib_run.id,
+                    'pose_index': calib_image.pose_index,
+                    'rotation_matrix': pose_result['rotation_matrix'],
+                    'translation_vector': pose_result['tvec'].ravel(),
+                    'computed_automatically': True,
+                    'reprojection_error_individual': pose_result['reprojection_error']
+                })
+                detected_images.append(calib_image)
                 
                 # Add to result list
                 camera_poses.append(pose_result['transformation_matrix'])
                 successful_count += 1
         
+        # One batched INSERT for all camera poses, then link each image to its pose
+        if camera_pose_rows:
+            camera_pose_ids = CameraPose.bulk_insert(self.db, camera_pose_rows)
+            for calib_image, camera_pose_id in zip(detected_images, camera_pose_ids):
+                calib_image.camera_pose_id = camera_pose_id
+        
         self.db.commit()
         
         if successful_count == 0:
@@ -286,27 +309,22 @@ class CalibrationService:
     def _load_robot_poses_as_matrices(self, calib_run: CalibrationRun) -> List[np.ndarray]:
         """Load robot poses from database and convert to 4x4 matrices."""
         
-        robot_poses = self.db.query(RobotPose).filter(
-            RobotPose.calibration_run_id == calib_run.id
-        ).order_by(RobotPose.pose_index).all()
+        # Read only the stored matrices as raw float64 bytes (no RobotPose objects are built)
+        stmt = (
+            select(RobotPose.rotation_matrix, RobotPose.translation_vector)
+            .where(RobotPose.calibration_run_id == calib_run.id)
+            .order_by(RobotPose.pose_index)
+        )
+        rows = self.db.execute(stmt).all()
         
-        matrices = []
+        matrices = np.empty((len(rows), 4, 4), dtype=np.float64)
+        matrices[:, 3, :] = (0.0, 0.0, 0.0, 1.0)
         
-        for robot_pose in robot_poses:
-            # Convert from X,Y,Z,Rx,Ry,Rz to 4x4 matrix
-            T = pose_euler_to_matrix(
-                robot_pose.x,
-                robot_pose.y,
-                robot_pose.z,
-                robot_pose.rx,
-                robot_pose.ry,
-                robot_pose.rz,
-                degrees=True  # Assuming degrees in database
-            )
-            
-            matrices.append(T)
+        for T, (rotation_raw, translation_raw) in zip(matrices, rows):
+            T[:3, :3] = np.frombuffer(rotation_raw, dtype=np.float64).reshape(3, 3)
+            T[:3, 3] = np.frombuffer(translation_raw, dtype=np.float64)
         
-        return matrices
+        return list(matrices)
     
     def _save_results(
         self,
@@ -319,7 +337,7 @@ class CalibrationService:
         """Save calibration results to database."""
         
         # Update calibration run with results
-        calib_run.transformation_matrix = calib_result['X'].tolist()
+        calib_run.transformation_matrix = calib_result['X']
         calib_run.reprojection_error = error_metrics['mean_error']
         calib_run.rotation_error_deg = error_metrics['mean_rotation_error_deg']
         calib_run.translation_error_mm = error_metrics['mean_translation_error_mm']
@@ -56,6 +56,13 @@ class ChArUcoDetector:
         
         # Detector parameters (same as user's code)
         self.detector_params = cv2.aruco.DetectorParameters()
+        
+        # Detectors are built once and reused for every image of the run
+        self.aruco_detector = cv2.aruco.ArucoDetector(self.aruco_dict, self.detector_params)
+        self.charuco_detector = cv2.aruco.CharucoDetector(self.board)
+        
+        # 3D board corners indexed by ChArUco corner ID, cast once for solvePnP
+        self.obj_points = np.asarray(self.board.getChessboardCorners(), dtype=np.float32)
 
     
     def detect_charuco(self, image: np.ndarray) -> Dict:
@@ -82,8 +89,7 @@ class ChArUcoDetector:
             gray = image
         
         # Detect ArUco markers using modern API
-        aruco_detector = cv2.aruco.ArucoDetector(self.aruco_dict, self.detector_params)
-        marker_corners, marker_ids, rejected = aruco_detector.detectMarkers(image)
+        marker_corners, marker_ids, rejected = self.aruco_detector.detectMarkers(image)
         
         # Initialize result
         result = {
@@ -100,8 +106,7 @@ class ChArUcoDetector:
         if marker_ids is not None and len(marker_ids) > 0:
             # Use CharucoDetector for modern OpenCV (4.7+)
             try:
-                charuco_detector = cv2.aruco.CharucoDetector(self.board)
-                charuco_corners, charuco_ids, _, _ = charuco_detector.detectBoard(image)
+                charuco_corners, charuco_ids, _, _ = self.charuco_detector.detectBoard(image)
                 
                 if charuco_corners is not None and len(charuco_corners) > 3:
                     result['detected'] = True
@@ -156,27 +161,17 @@ class ChArUcoDetector:
         try:
             # Get 3D object points for the detected ChArUco corners
             # ChArUco corners are the inner corners of the chessboard squares
-            obj_points = self.board.getChessboardCorners()
-            
-            # Filter object points to match detected corner IDs
-            detected_ids = detection['ids'].flatten()
+            detected_ids = detection['ids'].ravel()
             detected_corners = detection['corners'].reshape(-1, 2)
             
-            # Get corresponding 3D points for detected corners
-            obj_points_filtered = []
-            img_points_filtered = []
+            # Gather corresponding 3D points for detected corners (IDs outside the board are dropped)
+            valid = detected_ids < len(self.obj_points)
+            obj_points_np = self.obj_points[detected_ids[valid]]
+            img_points_np = detected_corners.astype(np.float32, copy=False)[valid]
             
-            for i, corner_id in enumerate(detected_ids):
-                if corner_id < len(obj_points):
-                    obj_points_filtered.append(obj_points[corner_id])
-                    img_points_filtered.append(detected_corners[i])
-            
-            if len(obj_points_filtered) < 4:
+            if len(obj_points_np) < 4:
                 return result
             
-            obj_points_np = np.array(obj_points_filtered, dtype=np.float32)
-            img_points_np = np.array(img_points_filtered, dtype=np.float32)
-            
             # Estimate pose using solvePnP (modern API)
             success, rvec, tvec = cv2.solvePnP(
                 obj_points_np,
@@ -240,7 +235,7 @@ class ChArUcoDetector:
             RMS reprojection error in pixels
         """
         # Get 3D object points for detected corners
-        obj_points = self.board.getChessboardCorners()[ids.ravel()]
+        obj_points = self.obj_points[ids.ravel()]
         
         # Project 3D points to image
         projected_points, _ = cv2.projectPoints(
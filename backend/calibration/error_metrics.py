@@ -7,6 +7,39 @@ from typing import List, Dict
 from scipy.spatial.transform import Rotation as R
 
 
+def target_base_transforms(
+    X: np.ndarray,
+    robot_poses: List[np.ndarray],
+    camera_poses: List[np.ndarray]
+) -> np.ndarray:
+    """
+    Compute T_target_base = A @ X @ B for every pose pair in one batched matmul.
+    
+    Args:
+        X: Hand-eye transformation (4x4 matrix)
+        robot_poses: Robot transformations A, list of 4x4 or (N,4,4) array
+        camera_poses: Camera transformations B, list of 4x4 or (N,4,4) array
+        
+    Returns:
+        (N,4,4) array of target-to-base transformations
+    """
+    return np.asarray(robot_poses) @ X @ np.asarray(camera_poses)
+
+
+def translation_residual(
+    X: np.ndarray,
+    robot_poses: List[np.ndarray],
+    camera_poses: List[np.ndarray]
+) -> float:
+    """
+    Mean distance of each pose's T_target_base translation from their mean.
+    
+    The target is fixed, so a perfect X maps every pose pair to the same point.
+    """
+    translations = target_base_transforms(X, robot_poses, camera_poses)[:, :3, 3]
+    return float(np.linalg.norm(translations - translations.mean(axis=0), axis=1).mean())
+
+
 def calculate_reprojection_error(
     X: np.ndarray,
     robot_poses: List[np.ndarray],
@@ -33,55 +66,21 @@ def calculate_reprojection_error(
         - rotation_errors_deg: List of rotation errors in degrees
         - translation_errors_mm: List of translation errors in mm
     """
-    individual_errors = []
-    rotation_errors = []
-    translation_errors = []
-    
     # Calculate T_target_base for each pose pair
     # For Eye-in-Hand: T_target_base = A * X * B
     # Where A = T_gripper_base, X = T_cam_gripper, B = T_target_cam
+    T_target_base = target_base_transforms(X, robot_poses, camera_poses)
     
-    T_target_base_list = []
-    
-    for A, B in zip(robot_poses, camera_poses):
-        # Calculate T = A @ X @ B
-        T = A @ X @ B
-        T_target_base_list.append(T)
-    
-    # Calculate mean transformation
-    # For translation, just mean
-    translations = np.array([T[:3, 3] for T in T_target_base_list])
-    mean_translation = np.mean(translations, axis=0)
-    
-    # For rotation, we need a proper mean (using chordal L2 mean or similar)
-    # Simple approximation: convert to rotation vectors, mean, back to matrix
-    # Or just pick the first one as reference for error calculation (common in simple implementations)
-    # Better: Use the first pose as reference to measure deviation
-    ref_T = T_target_base_list[0]
-    ref_R = ref_T[:3, :3]
-    ref_t = ref_T[:3, 3]
-    
-    # Calculate deviations from the first pose (or mean)
-    # Let's use the mean translation for translation error
-    # And the first rotation as reference for rotation error (simplifies averaging)
-    
-    for T in T_target_base_list:
-        R_curr = T[:3, :3]
-        t_curr = T[:3, 3]
-        
-        # Rotation error relative to reference
-        rot_error = calculate_rotation_error(ref_R, R_curr)
-        
-        # Translation error relative to mean
-        trans_error = calculate_translation_error(mean_translation, t_curr)
-        
-        rotation_errors.append(rot_error)
-        translation_errors.append(trans_error)
-        
-        # Combined error (heuristic)
-        individual_errors.append(trans_error + rot_error) # Mixing units, but useful for relative comparison
+    # Translation error relative to the mean translation
+    translations = T_target_base[:, :3, 3]
+    translation_errors = np.linalg.norm(translations - translations.mean(axis=0), axis=1)
+    
+    # Rotation error relative to the first pose (simplifies rotation averaging)
+    ref_R = T_target_base[0, :3, :3]
+    rotation_errors = np.degrees(R.from_matrix(ref_R.T @ T_target_base[:, :3, :3]).magnitude())
     
-    individual_errors = np.array(individual_errors)
+    # Combined error (heuristic)
+    individual_errors = translation_errors + rotation_errors # Mixing units, but useful for relative comparison
     
     # Get real reprojection errors from the camera poses if possible,
     # or just return the translation error logic, but DO NOT name translation error as reprojection error!
@@ -93,8 +92,8 @@ def calculate_reprojection_error(
         'max_error': float(np.max(translation_errors)),
         'min_error': float(np.min(translation_errors)),
         'individual_errors': individual_errors.tolist(),
-        'rotation_errors_deg': rotation_errors,
-        'translation_errors_mm': translation_errors,
+        'rotation_errors_deg': rotation_errors.tolist(),
+        'translation_errors_mm': translation_errors.tolist(),
         'mean_rotation_error_deg': float(np.mean(rotation_errors)),
         'mean_translation_error_mm': float(np.mean(translation_errors))
     }
@@ -30,6 +30,25 @@ def euler_to_rotation_matrix(rx: float, ry: float, rz: float, degrees: bool = Tr
     return rot.as_matrix()
 
 
+def euler_deg_to_matrices(angles: np.ndarray) -> np.ndarray:
+    """
+    Convert N sets of Euler angles in degrees to N 3x3 rotation matrices.
+    
+    Batched version of euler_to_rotation_matrix (same 'xyz' convention), used
+    when many poses are converted at once (e.g. CSV imports).
+    
+    Args:
+        angles: (N, 3) array of (rx, ry, rz) in degrees
+        
+    Returns:
+        (N, 3, 3) float64 array of rotation matrices
+    """
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1, 3)
+    if len(angles) == 0:
+        return np.empty((0, 3, 3), dtype=np.float64)
+    return R.from_euler('xyz', angles, degrees=True).as_matrix()
+
+
 def rotation_matrix_to_euler(rotation_matrix: np.ndarray, degrees: bool = True) -> Tuple[float, float, float]:
     """
     Convert a 3x3 rotation matrix to Euler angles.
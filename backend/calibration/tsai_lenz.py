@@ -9,10 +9,14 @@ Where:
 """
 import cv2
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from backend.calibration.transformations import matrix_to_rotation_translation
 
 
+# Method names indexed by OpenCV's CALIB_HAND_EYE_* constants (TSAI=0 ... DANIILIDIS=4)
+_METHOD_NAMES: Tuple[str, ...] = ("Tsai-Lenz", "Park-Martin", "Horaud", "Andreff", "Daniilidis")
+
+
 def solve_hand_eye_opencv(
     robot_poses: List[np.ndarray],
     camera_poses: List[np.ndarray],
@@ -40,51 +44,45 @@ def solve_hand_eye_opencv(
         - num_poses_used: Number of pose pairs used
         - method_name: Name of method used
     """
-    # Extract rotations and translations
-    R_gripper2base = []
-    t_gripper2base = []
-    R_target2cam = []
-    t_target2cam = []
-    
-    for A in robot_poses:
+    # Extract rotations and translations into preallocated contiguous arrays
+    n_robot = len(robot_poses)
+    n_camera = len(camera_poses)
+    R_gripper2base = np.empty((n_robot, 3, 3), dtype=np.float64)
+    t_gripper2base = np.empty((n_robot, 3, 1), dtype=np.float64)
+    R_target2cam = np.empty((n_camera, 3, 3), dtype=np.float64)
+    t_target2cam = np.empty((n_camera, 3, 1), dtype=np.float64)
+    
+    for i, A in enumerate(robot_poses):
         R, t = matrix_to_rotation_translation(A)
-        R_gripper2base.append(R)
-        t_gripper2base.append(t.reshape(3, 1))
+        R_gripper2base[i] = R
+        t_gripper2base[i] = t.reshape(3, 1)
     
-    for B in camera_poses:
+    for i, B in enumerate(camera_poses):
         R, t = matrix_to_rotation_translation(B)
-        R_target2cam.append(R)
-        t_target2cam.append(t.reshape(3, 1))
+        R_target2cam[i] = R
+        t_target2cam[i] = t.reshape(3, 1)
     
-    # Call OpenCV's calibrateHandEye
+    # Call OpenCV's calibrateHandEye (expects sequences of per-pose arrays; list() yields views)
     R_cam2gripper, t_cam2gripper = cv2.calibrateHandEye(
-        R_gripper2base,
-        t_gripper2base,
-        R_target2cam,
-        t_target2cam,
+        list(R_gripper2base),
+        list(t_gripper2base),
+        list(R_target2cam),
+        list(t_target2cam),
         method=method
     )
     
-    # Build homogeneous transformation matrix
-    X = np.eye(4)
+    # Build homogeneous transformation matrix (every entry is written, so skip zero-init)
+    X = np.empty((4, 4), dtype=np.float64)
     X[:3, :3] = R_cam2gripper
     X[:3, 3] = t_cam2gripper.ravel()
-    
-    # Get method name
-    method_names = {
-        cv2.CALIB_HAND_EYE_TSAI: "Tsai-Lenz",
-        cv2.CALIB_HAND_EYE_PARK: "Park-Martin",
-        cv2.CALIB_HAND_EYE_HORAUD: "Horaud",
-        cv2.CALIB_HAND_EYE_ANDREFF: "Andreff",
-        cv2.CALIB_HAND_EYE_DANIILIDIS: "Daniilidis"
-    }
+    X[3, :] = (0.0, 0.0, 0.0, 1.0)
     
     return {
         'X': X,
         'R_cam2gripper': R_cam2gripper,
         't_cam2gripper': t_cam2gripper,
         'num_poses_used': len(robot_poses),
-        'method_name': method_names.get(method, "Unknown")
+        'method_name': _METHOD_NAMES[method] if 0 <= method < len(_METHOD_NAMES) else "Unknown"
     }
 
 
@@ -112,6 +110,40 @@ def solve_hand_eye_tsai_lenz(
     )
 
 
+def _validate_core(robot: np.ndarray, camera: np.ndarray, atol: float):
+    """
+    Vectorized numeric checks for validate_pose_pairs.
+    
+    Args:
+        robot: Stacked robot poses (N, 4, 4)
+        camera: Stacked camera poses (M, 4, 4)
+        atol: Absolute tolerance for the duplicate check
+        
+    Returns:
+        Tuple of (robot_finite (N,), camera_finite (M,), dup_i, dup_j),
+        where dup_i/dup_j is the first near-identical robot pair or -1
+    """
+    robot_finite = np.isfinite(robot).all(axis=(1, 2))
+    camera_finite = np.isfinite(camera).all(axis=(1, 2))
+    
+    # All pairs at once (same test as np.allclose(robot[i], robot[j])); the
+    # upper triangle in row-major order gives the first matching pair
+    close = np.isclose(robot[:, None], robot[None], atol=atol).all(axis=(2, 3))
+    pairs = np.argwhere(np.triu(close, 1))
+    if len(pairs):
+        return robot_finite, camera_finite, int(pairs[0, 0]), int(pairs[0, 1])
+    
+    return robot_finite, camera_finite, -1, -1
+
+
+def _is_4x4(pose) -> bool:
+    """Whether `pose` converts to a numeric 4x4 array (ragged input does not)."""
+    try:
+        return np.asarray(pose, dtype=np.float64).shape == (4, 4)
+    except (TypeError, ValueError):
+        return False
+
+
 def validate_pose_pairs(
     robot_poses: List[np.ndarray],
     camera_poses: List[np.ndarray],
@@ -150,23 +182,32 @@ def validate_pose_pairs(
             f"Insufficient poses: need at least {min_poses}, got {num_poses}"
         )
     
-    # Check for NaN or Inf values
-    for i, pose in enumerate(robot_poses):
-        if np.any(np.isnan(pose)) or np.any(np.isinf(pose)):
+    # Check every pose is a 4x4 matrix before stacking them
+    shape_errors = []
+    for label, poses in (("Robot", robot_poses), ("Camera", camera_poses)):
+        for i, pose in enumerate(poses):
+            if not _is_4x4(pose):
+                shape_errors.append(f"{label} pose {i} is not a 4x4 matrix")
+    errors.extend(shape_errors)
+    
+    if not shape_errors:
+        # Numeric checks (finite values, first duplicate robot pose) on the stacked poses
+        robot_stack = np.array(robot_poses, dtype=np.float64).reshape(-1, 4, 4)
+        camera_stack = np.array(camera_poses, dtype=np.float64).reshape(-1, 4, 4)
+        robot_finite, camera_finite, dup_i, dup_j = _validate_core(robot_stack, camera_stack, 1e-6)
+        
+        # Check for NaN or Inf values
+        for i in np.flatnonzero(~robot_finite):
             errors.append(f"Robot pose {i} contains NaN or Inf values")
-    
-    for i, pose in enumerate(camera_poses):
-        if np.any(np.isnan(pose)) or np.any(np.isinf(pose)):
+        
+        for i in np.flatnonzero(~camera_finite):
             errors.append(f"Camera pose {i} contains NaN or Inf values")
-    
-    # Check for duplicate poses (robot)
-    for i in range(len(robot_poses)):
-        for j in range(i + 1, len(robot_poses)):
-            if np.allclose(robot_poses[i], robot_poses[j], atol=1e-6):
-                warnings.append(
-                    f"Robot poses {i} and {j} are very similar or identical"
-                )
-                break
+        
+        # Check for duplicate poses (robot) - one warning is enough
+        if dup_i >= 0:
+            warnings.append(
+                f"Robot poses {dup_i} and {dup_j} are very similar or identical"
+            )
     
     # Warn if too few poses
     if 3 <= num_poses < 8:
@@ -29,6 +29,8 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads/calibration_images"
     MAX_IMAGE_SIZE_MB: int = 10
     ALLOWED_IMAGE_EXTENSIONS: list = [".png", ".jpg", ".jpeg"]
+    # Files of one upload request saved concurrently (peak RAM ~ UPLOAD_CONCURRENCY x 1 MiB chunk)
+    UPLOAD_CONCURRENCY: int = 8
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -12,7 +12,8 @@ from .config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False},  # Required for SQLite
-    echo=settings.DEBUG  # Log SQL queries in debug mode
+    echo=settings.DEBUG,  # Log SQL queries in debug mode
+    query_cache_size=1200  # Compiled-statement cache (default 500) for repeated pose/image inserts
 )
 
 
@@ -29,6 +30,16 @@ def set_sqlite_pragma(dbapi_conn, connection_record):
     cursor.close()
 
 
+def optimize_database():
+    """
+    Run SQLite's PRAGMA optimize and release pooled connections.
+    Called on shutdown so the planner statistics for the (run, pose_index) indexes stay current.
+    """
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA optimize")
+    engine.dispose()
+
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
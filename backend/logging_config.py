@@ -2,6 +2,8 @@ import structlog
 import logging
 import sys
 
+from backend.config import settings
+
 def configure_logging():
     """
     Configure structured logging (JSON) for the application.
@@ -12,7 +14,8 @@ def configure_logging():
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=logging.INFO,
+        # DEBUG mode also shows development-only events (e.g. simulated MFA codes)
+        level=logging.DEBUG if settings.DEBUG else logging.INFO,
     )
 
     structlog.configure(
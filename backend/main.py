@@ -1,12 +1,16 @@
 """
 FastAPI main application entry point.
 """
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 from backend.config import settings
+from backend.database import optimize_database
 from backend.api import auth_router, calibrations_router, mfa_router
+import multiprocessing
 import os
 import structlog
 import time
@@ -19,6 +23,27 @@ from backend.logging_config import configure_logging
 configure_logging()
 logger = structlog.get_logger()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: owns the process pool used for upload-time ChArUco
+    detection (detect_and_annotate_batch) so it never blocks the event loop,
+    and refreshes SQLite's query planner statistics on shutdown.
+    """
+    # Spawned workers: forking this multithreaded server after OpenCV has been
+    # loaded and used can deadlock cv2 in the children
+    app.state.exec_pool = ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+    try:
+        yield
+    finally:
+        app.state.exec_pool.shutdown(wait=True)
+        optimize_database()
+
+
 # Seguridad A07: Configuración de Rate Limiting
 app = FastAPI(
     title=settings.APP_NAME,
@@ -26,7 +51,8 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
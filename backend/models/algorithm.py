@@ -1,9 +1,8 @@
 """
 Algorithm parameters model for configuring calibration algorithms.
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, func
 from sqlalchemy.orm import relationship
-from datetime import datetime
 
 from ..database import Base
 
@@ -26,7 +25,7 @@ class AlgorithmParameters(Base):
     
     # Metadata
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     is_default = Column(Boolean, default=False, nullable=False)
     description = Column(String(500), nullable=True)
     
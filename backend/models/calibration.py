@@ -1,12 +1,129 @@
 """
 Calibration-related models: CalibrationRun, RobotPose, and CameraPose.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum as SQLEnum, JSON, Boolean
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, JSON, Boolean, LargeBinary, Index, func, insert, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred, relationship, Session
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import enum
+import numpy as np
 
 from ..database import Base
+from .types import IntEnumType
+
+
+# Generic JSON everywhere, pre-parsed binary JSONB when running on PostgreSQL
+# (Python None is stored as SQL NULL rather than the JSON literal 'null')
+JSONVariant = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
+def pack_matrix(value) -> Optional[bytes]:
+    """Pack a matrix/vector (array or nested list) as raw float64 bytes for a BLOB column."""
+    if value is None:
+        return None
+    return np.ascontiguousarray(value, dtype=np.float64).tobytes()
+
+
+def unpack_matrix(raw: Optional[bytes], shape: Tuple[int, ...]) -> Optional[np.ndarray]:
+    """
+    Unpack raw float64 bytes from a BLOB column into an array of the given shape.
+    
+    The result is a zero-copy, read-only view of the column bytes; callers that
+    modify it in place (or pass it to APIs that require writable input, such as
+    scipy's Rotation.from_rotvec) must take a copy first.
+    """
+    if raw is None:
+        return None
+    return np.frombuffer(raw, dtype=np.float64).reshape(shape)
+
+
+# Rows per executemany INSERT issued by the bulk_* helpers
+BULK_INSERT_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=None)
+def _insert_statement(model, returning=None):
+    """INSERT for `model`, built once so every bulk insert reuses the same statement (and its compiled cache entry)."""
+    stmt = insert(model)
+    if returning is not None:
+        stmt = stmt.returning(returning, sort_by_parameter_order=True)
+    return stmt
+
+
+def _bulk_insert(session: Session, model, rows: List[Dict], returning=None) -> List:
+    """
+    Insert `rows` (dicts keyed by mapped attribute) as executemany batches of
+    BULK_INSERT_BATCH_SIZE. Nothing is committed here; the caller owns the transaction.
+    If `returning` is given, returns its values in the same order as `rows`.
+    """
+    stmt = _insert_statement(model, returning)
+    
+    returned = []
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        result = session.execute(stmt, rows[start:start + BULK_INSERT_BATCH_SIZE])
+        if returning is not None:
+            returned.extend(result.scalars().all())
+    return returned
+
+
+def _packed_component(column: str, index: int, size: int) -> property:
+    """
+    Float property reading/writing element `index` of a BLOB column packing `size`
+    float64s. Unset elements are stored as NaN and read back as None; a column
+    with no element set is stored as NULL.
+    """
+    
+    def getter(self) -> Optional[float]:
+        raw = getattr(self, column)
+        if raw is None:
+            return None
+        value = float(np.frombuffer(raw, dtype=np.float64)[index])
+        return None if np.isnan(value) else value
+    
+    def setter(self, value: Optional[float]) -> None:
+        raw = getattr(self, column)
+        values = np.full(size, np.nan) if raw is None else np.frombuffer(raw, dtype=np.float64).copy()
+        values[index] = np.nan if value is None else value
+        setattr(self, column, None if np.isnan(values).all() else values.tobytes())
+    
+    return property(getter, setter)
+
+
+class PoseMatricesMixin:
+    """
+    Exposes the `_rotation_matrix` / `_translation_vector` BLOB columns of a pose
+    model as NumPy arrays (instance level) or as the raw columns (query level).
+    """
+    
+    @hybrid_property
+    def rotation_matrix(self) -> np.ndarray:
+        """3x3 rotation matrix."""
+        return unpack_matrix(self._rotation_matrix, (3, 3))
+    
+    @rotation_matrix.inplace.setter
+    def _rotation_matrix_setter(self, value) -> None:
+        self._rotation_matrix = pack_matrix(value)
+    
+    @rotation_matrix.inplace.expression
+    @classmethod
+    def _rotation_matrix_expression(cls):
+        return cls._rotation_matrix
+    
+    @hybrid_property
+    def translation_vector(self) -> np.ndarray:
+        """Translation vector (3,)."""
+        return unpack_matrix(self._translation_vector, (3,))
+    
+    @translation_vector.inplace.setter
+    def _translation_vector_setter(self, value) -> None:
+        self._translation_vector = pack_matrix(value)
+    
+    @translation_vector.inplace.expression
+    @classmethod
+    def _translation_vector_expression(cls):
+        return cls._translation_vector
 
 
 class CalibrationStatus(str, enum.Enum):
@@ -35,7 +152,7 @@ class CalibrationRun(Base):
     name = Column(String(200), nullable=False)  # Calibration name
     description = Column(String(1000), nullable=True)  # Optional description
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
     algorithm_params_id = Column(Integer, ForeignKey("algorithm_parameters.id"), nullable=False)
     
     # ChArUco board parameters (provided by operator)
@@ -46,29 +163,31 @@ class CalibrationRun(Base):
     charuco_dictionary = Column(String(50), default="DICT_4X4_50", nullable=False)  # ArUco dictionary type
     
     # Robot poses input method
-    robot_poses_input_method = Column(SQLEnum(RobotPoseInputMethod), nullable=True)
+    robot_poses_input_method = Column(IntEnumType(RobotPoseInputMethod), nullable=True)
     csv_filename = Column(String(255), nullable=True)  # Original CSV filename if imported
     
-    # Results (stored as JSON for the 4x4 transformation matrix)
-    transformation_matrix = Column(JSON, nullable=True)  # 4x4 homogeneous transformation matrix
+    # Results (4x4 transformation matrix stored as raw float64 bytes, 128 B)
+    _transformation_matrix = Column("transformation_matrix", LargeBinary(128), nullable=True)
     reprojection_error = Column(Float, nullable=True)
     rotation_error_deg = Column(Float, nullable=True)  # Rotation error in degrees
     translation_error_mm = Column(Float, nullable=True)  # Translation error in mm
     poses_valid = Column(Integer, nullable=True)  # Number of valid poses used
     poses_processed = Column(Integer, nullable=True)  # Total number of poses processed
     method = Column(String(50), nullable=True)  # Calibration method used (e.g., "Tsai-Lenz")
-    status = Column(SQLEnum(CalibrationStatus), default=CalibrationStatus.PENDING, nullable=False)
+    status = Column(IntEnumType(CalibrationStatus), default=CalibrationStatus.PENDING, nullable=False, index=True)
     
     # Camera calibration parameters (intrinsic matrix and distortion coefficients)
-    camera_fx = Column(Float, nullable=True)  # Focal length X
-    camera_fy = Column(Float, nullable=True)  # Focal length Y
-    camera_cx = Column(Float, nullable=True)  # Principal point X
-    camera_cy = Column(Float, nullable=True)  # Principal point Y
-    camera_k1 = Column(Float, nullable=True)  # Radial distortion k1
-    camera_k2 = Column(Float, nullable=True)  # Radial distortion k2
-    camera_p1 = Column(Float, nullable=True)  # Tangential distortion p1
-    camera_p2 = Column(Float, nullable=True)  # Tangential distortion p2
-    camera_k3 = Column(Float, nullable=True)  # Radial distortion k3
+    # Packed as nine float64s (72 B): fx, fy, cx, cy, k1, k2, p1, p2, k3 (NaN = not provided)
+    _camera_intrinsics = Column("camera_intrinsics", LargeBinary(72), nullable=True)
+    camera_fx = _packed_component('_camera_intrinsics', 0, 9)  # Focal length X
+    camera_fy = _packed_component('_camera_intrinsics', 1, 9)  # Focal length Y
+    camera_cx = _packed_component('_camera_intrinsics', 2, 9)  # Principal point X
+    camera_cy = _packed_component('_camera_intrinsics', 3, 9)  # Principal point Y
+    camera_k1 = _packed_component('_camera_intrinsics', 4, 9)  # Radial distortion k1
+    camera_k2 = _packed_component('_camera_intrinsics', 5, 9)  # Radial distortion k2
+    camera_p1 = _packed_component('_camera_intrinsics', 6, 9)  # Tangential distortion p1
+    camera_p2 = _packed_component('_camera_intrinsics', 7, 9)  # Tangential distortion p2
+    camera_k3 = _packed_component('_camera_intrinsics', 8, 9)  # Radial distortion k3
     camera_calibration_source = Column(String(20), nullable=True)  # "default", "manual", or "file"
     
     # Additional metadata
@@ -81,67 +200,205 @@ class CalibrationRun(Base):
     algorithm_params = relationship("AlgorithmParameters", back_populates="calibration_runs")
     images = relationship("CalibrationImage", back_populates="calibration_run", cascade="all, delete-orphan")
     
+    @hybrid_property
+    def transformation_matrix(self) -> Optional[np.ndarray]:
+        """4x4 homogeneous transformation matrix."""
+        return unpack_matrix(self._transformation_matrix, (4, 4))
+    
+    @transformation_matrix.inplace.setter
+    def _transformation_matrix_setter(self, value) -> None:
+        self._transformation_matrix = pack_matrix(value)
+    
+    @transformation_matrix.inplace.expression
+    @classmethod
+    def _transformation_matrix_expression(cls):
+        return cls._transformation_matrix
+    
+    @hybrid_property
+    def camera_intrinsics(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        (camera_matrix 3x3, dist_coeffs (5,)) ready to pass to OpenCV.
+        Each part is None unless all of its values were provided.
+        """
+        if self._camera_intrinsics is None:
+            return None, None
+        a = np.frombuffer(self._camera_intrinsics, dtype=np.float64)
+        camera_matrix = None
+        if not np.isnan(a[:4]).any():
+            camera_matrix = np.array([
+                [a[0], 0.0, a[2]],
+                [0.0, a[1], a[3]],
+                [0.0, 0.0, 1.0]
+            ])
+        dist_coeffs = None if np.isnan(a[4:]).any() else a[4:].copy()
+        return camera_matrix, dist_coeffs
+    
+    @camera_intrinsics.inplace.expression
+    @classmethod
+    def _camera_intrinsics_expression(cls):
+        return cls._camera_intrinsics
+    
     def __repr__(self):
         return f"<CalibrationRun(id={self.id}, status='{self.status.value}', error={self.reprojection_error})>"
 
 
-class RobotPose(Base):
+class RobotPose(PoseMatricesMixin, Base):
     """
     Model representing a single robot pose in a calibration sequence.
     Stores the rotation matrix and translation vector.
     """
     __tablename__ = "robot_poses"
+    __table_args__ = (
+        # One row per pose_index within a run; also serves "WHERE run ORDER BY pose_index"
+        Index("ix_robot_poses_run_pose_index", "calibration_run_id", "pose_index", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    calibration_run_id = Column(Integer, ForeignKey("calibration_runs.id"), nullable=False, index=True)
+    calibration_run_id = Column(Integer, ForeignKey("calibration_runs.id"), nullable=False)
     pose_index = Column(Integer, nullable=False)  # Order of the pose in the sequence
     
-    # Original pose format (as provided by operator: X, Y, Z, Rx, Ry, Rz)
-    x = Column(Float, nullable=False)  # X position (mm or m)
-    y = Column(Float, nullable=False)  # Y position (mm or m)
-    z = Column(Float, nullable=False)  # Z position (mm or m)
-    rx = Column(Float, nullable=False)  # Rotation around X (degrees)
-    ry = Column(Float, nullable=False)  # Rotation around Y (degrees)
-    rz = Column(Float, nullable=False)  # Rotation around Z (degrees)
+    # Original pose format (as provided by operator: X, Y, Z, Rx, Ry, Rz),
+    # stored as six contiguous float64s (48 B) in that order
+    _pose = Column("pose", LargeBinary(48), nullable=False)
     
     # Input method
-    input_method = Column(SQLEnum(RobotPoseInputMethod), nullable=False)
+    input_method = Column(IntEnumType(RobotPoseInputMethod), nullable=False)
     
-    # Computed transformation matrices (from X,Y,Z,Rx,Ry,Rz)
-    rotation_matrix = Column(JSON, nullable=False)  # 3x3 rotation matrix (computed)
-    translation_vector = Column(JSON, nullable=False)  # 3x1 translation vector (computed)
+    # Computed transformation matrices (from X,Y,Z,Rx,Ry,Rz), stored as raw float64 bytes.
+    # Not part of pose listings; loaded together on first access (the solver selects them directly)
+    _rotation_matrix = deferred(Column("rotation_matrix", LargeBinary(72), nullable=False), group="matrices")  # 3x3 rotation matrix (computed)
+    _translation_vector = deferred(Column("translation_vector", LargeBinary(24), nullable=False), group="matrices")  # 3x1 translation vector (computed)
     
     # Relationship
     calibration_run = relationship("CalibrationRun", back_populates="robot_poses")
     
+    @hybrid_property
+    def pose(self) -> np.ndarray:
+        """Pose as a (6,) array: x, y, z (mm or m), rx, ry, rz (degrees)."""
+        return unpack_matrix(self._pose, (6,))
+    
+    @pose.inplace.setter
+    def _pose_setter(self, value) -> None:
+        self._pose = pack_matrix(value)
+    
+    @pose.inplace.expression
+    @classmethod
+    def _pose_expression(cls):
+        return cls._pose
+    
+    x = _packed_component('_pose', 0, 6)  # X position (mm or m)
+    y = _packed_component('_pose', 1, 6)  # Y position (mm or m)
+    z = _packed_component('_pose', 2, 6)  # Z position (mm or m)
+    rx = _packed_component('_pose', 3, 6)  # Rotation around X (degrees)
+    ry = _packed_component('_pose', 4, 6)  # Rotation around Y (degrees)
+    rz = _packed_component('_pose', 5, 6)  # Rotation around Z (degrees)
+    
+    @classmethod
+    def load_pose_array(cls, session: Session, run_id: int) -> np.ndarray:
+        """
+        Load every pose of a run as an (N, 6) array (ordered by pose_index),
+        decoding all rows with a single np.frombuffer over the joined bytes.
+        """
+        raw = session.execute(
+            select(cls._pose)
+            .where(cls.calibration_run_id == run_id)
+            .order_by(cls.pose_index)
+        ).scalars().all()
+        return np.frombuffer(b''.join(raw), dtype=np.float64).reshape(-1, 6)
+    
+    @classmethod
+    def bulk_from_csv(
+        cls,
+        session: Session,
+        run_id: int,
+        poses: List[Dict],
+        input_method: RobotPoseInputMethod = RobotPoseInputMethod.CSV_IMPORT
+    ) -> int:
+        """
+        Insert parsed CSV poses (dicts with pose_index, x, y, z, rx, ry, rz) for a run.
+        Rotation matrices for all poses are computed in a single batched call.
+        
+        Returns:
+            Number of poses inserted
+        """
+        # Imported here: the calibration package's __init__ imports the models
+        from ..calibration.transformations import euler_deg_to_matrices
+        
+        if not poses:
+            return 0
+        
+        # (N, 6) array of x, y, z, rx, ry, rz
+        values = np.asarray(
+            [(p['x'], p['y'], p['z'], p['rx'], p['ry'], p['rz']) for p in poses],
+            dtype=np.float64
+        )
+        translations = values[:, :3]
+        rotations = euler_deg_to_matrices(values[:, 3:])
+        
+        rows = [
+            {
+                'calibration_run_id': run_id,
+                'pose_index': p['pose_index'],
+                'input_method': input_method,
+                '_pose': pose.tobytes(),
+                '_rotation_matrix': pack_matrix(rotation),
+                '_translation_vector': pack_matrix(translation)
+            }
+            for p, pose, rotation, translation in zip(poses, values, rotations, translations)
+        ]
+        _bulk_insert(session, cls, rows)
+        return len(rows)
+    
     def __repr__(self):
         return f"<RobotPose(id={self.id}, calibration_run_id={self.calibration_run_id}, index={self.pose_index})>"
 
 
-class CameraPose(Base):
+class CameraPose(PoseMatricesMixin, Base):
     """
     Model representing a single camera pose in a calibration sequence.
     Stores the rotation matrix and translation vector.
     Must correspond to a RobotPose with the same pose_index.
     """
     __tablename__ = "camera_poses"
+    __table_args__ = (
+        # One row per pose_index within a run; also serves "WHERE run ORDER BY pose_index"
+        Index("ix_camera_poses_run_pose_index", "calibration_run_id", "pose_index", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    calibration_run_id = Column(Integer, ForeignKey("calibration_runs.id"), nullable=False, index=True)
+    calibration_run_id = Column(Integer, ForeignKey("calibration_runs.id"), nullable=False)
     pose_index = Column(Integer, nullable=False)  # Must match corresponding RobotPose
     
-    # Pose data (computed automatically from ChArUco image using OpenCV)
-    rotation_matrix = Column(JSON, nullable=False)  # 3x3 rotation matrix (computed via solvePnP)
-    translation_vector = Column(JSON, nullable=False)  # 3x1 translation vector (computed via solvePnP)
+    # Pose data (computed automatically from ChArUco image using OpenCV), stored as raw float64 bytes
+    _rotation_matrix = Column("rotation_matrix", LargeBinary(72), nullable=False)  # 3x3 rotation matrix (computed via solvePnP)
+    _translation_vector = Column("translation_vector", LargeBinary(24), nullable=False)  # 3x1 translation vector (computed via solvePnP)
     
     # Computation metadata
     computed_automatically = Column(Boolean, default=True, nullable=False)  # Always True (computed by OpenCV)
     reprojection_error_individual = Column(Float, nullable=True)  # Reprojection error for this specific pose
-    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    computed_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     # Relationship
     calibration_run = relationship("CalibrationRun", back_populates="camera_poses")
     
+    @classmethod
+    def bulk_insert(cls, session: Session, rows: List[Dict]) -> List[int]:
+        """
+        Insert camera poses (dicts keyed by attribute, matrices as arrays) in batches.
+        
+        Returns:
+            New CameraPose ids, in the same order as `rows`
+        """
+        packed = [
+            {
+                **{k: v for k, v in row.items() if k not in ('rotation_matrix', 'translation_vector')},
+                '_rotation_matrix': pack_matrix(row['rotation_matrix']),
+                '_translation_vector': pack_matrix(row['translation_vector'])
+            }
+            for row in rows
+        ]
+        return _bulk_insert(session, cls, packed, returning=cls.id)
+    
     def __repr__(self):
         return f"<CameraPose(id={self.id}, calibration_run_id={self.calibration_run_id}, index={self.pose_index})>"
 
@@ -152,16 +409,21 @@ class CalibrationImage(Base):
     Each image is processed to detect the ChArUco board and calculate camera pose.
     """
     __tablename__ = "calibration_images"
+    __table_args__ = (
+        # One row per pose_index within a run; also serves "WHERE run ORDER BY pose_index"
+        Index("ix_calibration_images_run_pose_index", "calibration_run_id", "pose_index", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    calibration_run_id = Column(Integer, ForeignKey("calibration_runs.id"), nullable=False, index=True)
+    calibration_run_id = Column(Integer, ForeignKey("calibration_runs.id"), nullable=False)
     pose_index = Column(Integer, nullable=False)  # Links to corresponding RobotPose
     
     # File metadata
     image_path = Column(String(500), nullable=False)  # Relative path to uploaded image
     annotated_image_path = Column(String(500), nullable=True)  # Path to annotated image with ChArUco detection
+    thumbnail_path = Column(String(500), nullable=True)  # Small JPEG of the annotated image for galleries
     original_filename = Column(String(255), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    uploaded_at = Column(DateTime, server_default=func.now(), nullable=False)
     file_size_bytes = Column(Integer, nullable=False)
     image_width = Column(Integer, nullable=True)  # Image width in pixels
     image_height = Column(Integer, nullable=True)  # Image height in pixels
@@ -170,8 +432,9 @@ class CalibrationImage(Base):
     charuco_detected = Column(Boolean, default=False, nullable=False)  # Was board detected?
     corners_detected = Column(Integer, nullable=True)  # Number of corners detected
     ids_detected = Column(Integer, nullable=True)  # Number of ArUco IDs detected
-    charuco_corners = Column(JSON, nullable=True)  # Detected corner coordinates (2D points)
-    charuco_ids = Column(JSON, nullable=True)  # Detected corner IDs
+    # Not part of image listings; loaded together on first access
+    charuco_corners = deferred(Column(JSONVariant, nullable=True), group="charuco")  # Detected corner coordinates (2D points)
+    charuco_ids = deferred(Column(JSONVariant, nullable=True), group="charuco")  # Detected corner IDs
     
     # Link to computed camera pose
     camera_pose_id = Column(Integer, ForeignKey("camera_poses.id"), nullable=True)  # Set after processing
@@ -180,5 +443,10 @@ class CalibrationImage(Base):
     calibration_run = relationship("CalibrationRun", back_populates="images")
     camera_pose = relationship("CameraPose", foreign_keys=[camera_pose_id])
     
+    @classmethod
+    def bulk_insert(cls, session: Session, rows: List[Dict]) -> None:
+        """Insert image records (dicts keyed by attribute) in batches."""
+        _bulk_insert(session, cls, rows)
+    
     def __repr__(self):
         return f"<CalibrationImage(id={self.id}, pose_index={self.pose_index}, detected={self.charuco_detected})>"
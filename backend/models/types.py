@@ -0,0 +1,40 @@
+"""
+Custom column types shared by the models.
+"""
+import enum
+from typing import Optional, Type
+
+from sqlalchemy import SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class IntEnumType(TypeDecorator):
+    """
+    Stores a Python enum as a SMALLINT code instead of its name.
+    
+    Codes follow the declaration order of the enum members, so new members must
+    only ever be appended. The Python side keeps working with enum members.
+    """
+    impl = SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class: Type[enum.Enum], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enum_class = enum_class
+        self._members = tuple(enum_class)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+    
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        # Also accept raw values such as "pending" (str enums compare equal to them)
+        return self._codes[self.enum_class(value)]
+    
+    def process_result_value(self, value, dialect) -> Optional[enum.Enum]:
+        if value is None:
+            return None
+        return self._members[int(value)]
+    
+    def code_for(self, member: enum.Enum) -> int:
+        """SMALLINT code stored for `member`."""
+        return self._codes[member]
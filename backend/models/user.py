@@ -1,12 +1,14 @@
 """
 User model for authentication and role-based access control.
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, LargeBinary, func
+from sqlalchemy.orm import relationship, reconstructor
+from typing import Optional
 import enum
 
 from ..database import Base
+from .types import IntEnumType
+from ..utils.encryption import EncryptionService
 
 
 class UserRole(str, enum.Enum):
@@ -31,14 +33,14 @@ class User(Base):
     username = Column(String(50), unique=True, nullable=False, index=True)
     email = Column(String(100), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
-    role = Column(SQLEnum(UserRole), default=UserRole.TECHNICIAN, nullable=False)
+    role = Column(IntEnumType(UserRole), default=UserRole.TECHNICIAN, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
     
     # MFA fields
     mfa_enabled = Column(Boolean, default=False, nullable=False)
-    mfa_secret = Column(String(32), nullable=True) # Seguridad A07: Secret for MFA (TOTP/Simulated)
-    mfa_code = Column(String(255), nullable=True)  # Encrypted code
+    mfa_secret = Column(LargeBinary, nullable=True) # Seguridad A07: Encrypted secret for MFA (TOTP/Simulated), raw nonce + ciphertext
+    mfa_code = Column(LargeBinary, nullable=True)  # Encrypted code, raw nonce + ciphertext
     mfa_code_expires_at = Column(DateTime, nullable=True)
     
     # Relationships
@@ -48,23 +50,41 @@ class User(Base):
     def __repr__(self):
         return f"<User(username='{self.username}', role='{self.role.value}')>"
 
+    @reconstructor
+    def _init_on_load(self):
+        # Rows loaded from the database start with an empty plaintext cache
+        self._clear_plaintext_cache()
+
+    def _clear_plaintext_cache(self):
+        self.__dict__.pop('_mfa_secret_plain', None)
+        self.__dict__.pop('_mfa_code_plain', None)
+
+    def _decrypt_cached(self, cache_key: str, ciphertext: Optional[bytes]) -> Optional[str]:
+        """
+        Decrypt `ciphertext` once per value: the plaintext is cached on the instance
+        together with the ciphertext it came from, so direct column assignments
+        (e.g. `mfa_code = None`) are never answered from a stale cache.
+        """
+        if not ciphertext:
+            return None
+        cached = self.__dict__.get(cache_key)
+        if cached is not None and cached[0] == ciphertext:
+            return cached[1]
+        plain = EncryptionService.decrypt_bytes(ciphertext)
+        self.__dict__[cache_key] = (ciphertext, plain)
+        return plain
+
     # Seguridad A02: Métodos para encriptar/desencriptar datos sensibles
     def set_mfa_secret(self, secret: str):
-        from backend.utils.encryption import EncryptionService
-        self.mfa_secret = EncryptionService.encrypt(secret)
+        self.mfa_secret = EncryptionService.encrypt_bytes(secret)
+        self.__dict__['_mfa_secret_plain'] = (self.mfa_secret, secret)
 
     def get_mfa_secret(self) -> str:
-        from backend.utils.encryption import EncryptionService
-        if not self.mfa_secret:
-            return None
-        return EncryptionService.decrypt(self.mfa_secret)
+        return self._decrypt_cached('_mfa_secret_plain', self.mfa_secret)
 
     def set_mfa_code(self, code: str):
-        from backend.utils.encryption import EncryptionService
-        self.mfa_code = EncryptionService.encrypt(code)
+        self.mfa_code = EncryptionService.encrypt_bytes(code)
+        self.__dict__['_mfa_code_plain'] = (self.mfa_code, code)
 
     def get_mfa_code(self) -> str:
-        from backend.utils.encryption import EncryptionService
-        if not self.mfa_code:
-            return None
-        return EncryptionService.decrypt(self.mfa_code)
+        return self._decrypt_cached('_mfa_code_plain', self.mfa_code)
@@ -2,9 +2,10 @@
 Pydantic schemas for calibration-related API endpoints.
 Defines request/response models for calibration runs, robot poses, and execution results.
 """
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, validator, field_validator
+from typing import Any, Dict, Optional, List
 from datetime import datetime
+import numpy as np
 from backend.models.calibration import CalibrationStatus, RobotPoseInputMethod
 
 
@@ -37,6 +38,20 @@ class CalibrationRunCreate(BaseModel):
         return v
 
 
+# Order of the values packed in CalibrationRun.camera_intrinsics
+CAMERA_INTRINSIC_FIELDS = (
+    'camera_fx', 'camera_fy', 'camera_cx', 'camera_cy',
+    'camera_k1', 'camera_k2', 'camera_p1', 'camera_p2', 'camera_k3'
+)
+
+
+def _unpack_list(raw: Optional[bytes], shape) -> Optional[list]:
+    """Raw float64 BLOB -> nested list of the given shape."""
+    if raw is None:
+        return None
+    return np.frombuffer(raw, dtype=np.float64).reshape(shape).tolist()
+
+
 class CalibrationRunResponse(BaseModel):
     """Schema for calibration run response"""
     id: int
@@ -74,8 +89,32 @@ class CalibrationRunResponse(BaseModel):
     camera_k3: Optional[float] = None
     camera_calibration_source: Optional[str] = None
     
-    class Config:
-        from_attributes = True  # For Pydantic v2 (was orm_mode in v1)
+    @classmethod
+    def from_row(cls, row) -> Dict[str, Any]:
+        """
+        JSON-ready dict for a Core row of calibration_runs table columns, without
+        building an ORM object or a model instance (rows come straight from the DB).
+        """
+        mapping = row._mapping
+        data = {name: mapping[name] for name in cls.model_fields if name in mapping}
+        data['transformation_matrix'] = _unpack_list(row.transformation_matrix, (4, 4))
+        
+        intrinsics = row.camera_intrinsics
+        values = (
+            np.frombuffer(intrinsics, dtype=np.float64) if intrinsics is not None
+            else (np.nan,) * len(CAMERA_INTRINSIC_FIELDS)
+        )
+        for name, value in zip(CAMERA_INTRINSIC_FIELDS, values):
+            data[name] = None if np.isnan(value) else float(value)
+        return data
+    
+    @field_validator('transformation_matrix', mode='before')
+    @classmethod
+    def matrix_to_list(cls, v):
+        # Matrices are stored as float64 BLOBs and loaded as arrays; convert at the API boundary
+        return v.tolist() if isinstance(v, np.ndarray) else v
+    
+    model_config = ConfigDict(from_attributes=True, revalidate_instances='never')  # For Pydantic v2 (was orm_mode in v1)
 
 
 class RobotPoseCreate(BaseModel):
@@ -102,8 +141,7 @@ class RobotPoseResponse(BaseModel):
     rz: float
     input_method: str
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances='never')
 
 
 class CalibrationImageResponse(BaseModel):
@@ -113,6 +151,7 @@ class CalibrationImageResponse(BaseModel):
     pose_index: int
     image_path: str
     annotated_image_path: Optional[str]
+    thumbnail_path: Optional[str] = None
     original_filename: str
     uploaded_at: datetime
     file_size_bytes: int
@@ -123,8 +162,7 @@ class CalibrationImageResponse(BaseModel):
     ids_detected: Optional[int]
     camera_pose_id: Optional[int]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances='never')
 
 
 class CameraPoseResponse(BaseModel):
@@ -138,8 +176,12 @@ class CameraPoseResponse(BaseModel):
     reprojection_error_individual: Optional[float]
     computed_at: Optional[datetime]
     
-    class Config:
-        from_attributes = True
+    @field_validator('rotation_matrix', 'translation_vector', mode='before')
+    @classmethod
+    def array_to_list(cls, v):
+        return v.tolist() if isinstance(v, np.ndarray) else v
+    
+    model_config = ConfigDict(from_attributes=True, revalidate_instances='never')
 
 
 class CalibrationExecuteResponse(BaseModel):
@@ -154,6 +196,8 @@ class CalibrationExecuteResponse(BaseModel):
     poses_valid: int
     method: Optional[str] = None
     error_message: Optional[str] = None
+    # Full updated run on success, so clients can show the results without re-fetching it
+    calibration: Optional[CalibrationRunResponse] = None
 
 
 class CSVImportResponse(BaseModel):
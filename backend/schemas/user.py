@@ -2,12 +2,22 @@
 Pydantic schemas for User model.
 Used for request/response validation in the API.
 """
-from pydantic import BaseModel, EmailStr, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, field_validator
 from datetime import datetime
 from typing import Optional
+import re
 from backend.models.user import UserRole
 
 
+PASSWORD_SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+
+# Whole password policy in one compiled pass: digit, upper, lower, special, length >= 8
+_PASSWORD_RE = re.compile(
+    r'^(?=.*\d)(?=.*[A-Z])(?=.*[a-z])(?=.*[' + re.escape(PASSWORD_SPECIAL_CHARS) + r'])[\s\S]{8,}$',
+    re.DOTALL
+)
+
+
 class UserBase(BaseModel):
     """Base User schema with common fields."""
     username: str
@@ -22,6 +32,9 @@ class UserCreate(UserBase):
     @field_validator('password')
     def validate_password(cls, v):
         # Seguridad A07: Política de contraseñas fuertes
+        if _PASSWORD_RE.match(v):
+            return v
+        # Rejected: find the first failing rule for a specific error message
         if len(v) < 8:
             raise ValueError('Password must be at least 8 characters long')
         if not any(char.isdigit() for char in v):
@@ -30,7 +43,7 @@ class UserCreate(UserBase):
             raise ValueError('Password must contain at least one uppercase letter')
         if not any(char.islower() for char in v):
             raise ValueError('Password must contain at least one lowercase letter')
-        if not any(char in "!@#$%^&*()_+-=[]{}|;:,.<>?" for char in v):
+        if not any(char in PASSWORD_SPECIAL_CHARS for char in v):
             raise ValueError('Password must contain at least one special character')
         return v
 
@@ -42,8 +55,7 @@ class UserResponse(UserBase):
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True  # Allows ORM model to dict conversion
+    model_config = ConfigDict(from_attributes=True, revalidate_instances='never')  # Allows ORM model to dict conversion
 
 
 class UserInDB(UserBase):
@@ -53,5 +65,4 @@ class UserInDB(UserBase):
     role: UserRole
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, revalidate_instances='never')
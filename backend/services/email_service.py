@@ -1,21 +1,25 @@
-import random
-import string
-from datetime import datetime, timedelta
+import secrets
+import structlog
+
+from backend.config import settings
+
+logger = structlog.get_logger()
+
 
 class EmailService:
     @staticmethod
     def generate_code(length=6) -> str:
-        """Generate a random numeric code."""
-        return ''.join(random.choices(string.digits, k=length))
+        """Generate a random numeric code (single CSPRNG draw, zero-padded)."""
+        return f"{secrets.randbelow(10 ** length):0{length}d}"
 
     @staticmethod
-    def send_mfa_code(email: str, code: str):
+    async def send_mfa_code(email: str, code: str):
         """
         Send MFA code to user's email.
-        For development, this prints to the console.
+        For development, this logs the send instead of emailing it. The code itself
+        is only logged at DEBUG level in DEBUG mode (Seguridad A09: never store codes in the logs).
         """
-        print("\n" + "="*50)
-        print(f"📧 EMAIL SIMULATION - To: {email}")
-        print(f"🔐 Your MFA Verification Code is: {code}")
-        print("="*50 + "\n")
+        logger.info("mfa_code_email_simulated", to=email)
+        if settings.DEBUG:
+            logger.debug("mfa_code_email_simulated_code", to=email, code=code)
         return True
@@ -2,11 +2,18 @@
 Export service for calibration results.
 Provides functionality to export calibration data in multiple formats (JSON, CSV, TXT).
 """
-import json
+import csv
+import io
+import orjson
 from typing import Dict, Any
 from backend.models.calibration import CalibrationRun
 
 
+# Section rules of the TXT summary
+_RULE_HEAVY = "=" * 70
+_RULE_LIGHT = "-" * 70
+
+
 class ExportService:
     """Service for exporting calibration results in different formats."""
     
@@ -26,6 +33,7 @@ class ExportService:
             "name": calibration.name,
             "description": calibration.description,
             "status": calibration.status,
+            # Naive isoformat() as before (no UTC offset); the ndarray is serialized natively by orjson
             "created_at": calibration.created_at.isoformat() if calibration.created_at else None,
             "transformation_matrix": calibration.transformation_matrix,
             "metrics": {
@@ -45,7 +53,10 @@ class ExportService:
             "method": calibration.method
         }
         
-        return json.dumps(data, indent=2)
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
     
     @staticmethod
     def export_to_csv(calibration: CalibrationRun) -> str:
@@ -58,37 +69,35 @@ class ExportService:
         Returns:
             CSV string with transformation matrix
         """
+        # Decoded once by the model from its packed float64 column
         matrix = calibration.transformation_matrix
         
-        # Handle case where matrix might be a JSON string
-        if isinstance(matrix, str):
-            matrix = json.loads(matrix)
+        buf = io.StringIO()
         
-        # Create CSV header
-        csv_lines = [
-            "# Hand-Eye Calibration Transformation Matrix",
-            f"# Calibration: {calibration.name}",
-            f"# ID: {calibration.id}",
-            f"# Status: {calibration.status}",
-            "#",
-            "# Transformation Matrix (4x4):"
-        ]
+        # Comment header
+        buf.write(
+            "# Hand-Eye Calibration Transformation Matrix\n"
+            f"# Calibration: {calibration.name}\n"
+            f"# ID: {calibration.id}\n"
+            f"# Status: {calibration.status}\n"
+            "#\n"
+            "# Transformation Matrix (4x4):\n"
+        )
         
-        # Add matrix rows
-        for row in matrix:
-            csv_lines.append(",".join(str(val) for val in row))
+        # Matrix rows
+        csv.writer(buf, lineterminator="\n").writerows(matrix)
         
-        # Add metrics as comments
-        csv_lines.extend([
-            "#",
-            "# Metrics:",
-            f"# Reprojection Error: {calibration.reprojection_error}",
-            f"# Rotation Error (deg): {calibration.rotation_error_deg}",
-            f"# Translation Error (mm): {calibration.translation_error_mm}",
-            f"# Poses Valid/Processed: {calibration.poses_valid}/{calibration.poses_processed}"
-        ])
+        # Metrics as comments
+        buf.write(
+            "#\n"
+            "# Metrics:\n"
+            f"# Reprojection Error: {calibration.reprojection_error}\n"
+            f"# Rotation Error (deg): {calibration.rotation_error_deg}\n"
+            f"# Translation Error (mm): {calibration.translation_error_mm}\n"
+            f"# Poses Valid/Processed: {calibration.poses_valid}/{calibration.poses_processed}\n"
+        )
         
-        return "\n".join(csv_lines)
+        return buf.getvalue()
     
     @staticmethod
     def export_to_txt(calibration: CalibrationRun) -> str:
@@ -101,54 +110,45 @@ class ExportService:
         Returns:
             TXT string with human-readable summary
         """
+        # Decoded once by the model from its packed float64 column
         matrix = calibration.transformation_matrix
         
-        # Handle case where matrix might be a JSON string
-        if isinstance(matrix, str):
-            matrix = json.loads(matrix)
-        
-        lines = [
-            "=" * 70,
-            "HAND-EYE CALIBRATION RESULTS",
-            "=" * 70,
-            "",
-            f"Calibration Name: {calibration.name}",
-            f"ID: {calibration.id}",
-            f"Status: {calibration.status}",
-            f"Date: {calibration.created_at.strftime('%Y-%m-%d %H:%M:%S') if calibration.created_at else 'N/A'}",
-            f"Method: {calibration.method or 'Tsai-Lenz'}",
-            "",
-            "-" * 70,
-            "TRANSFORMATION MATRIX (Camera to End-Effector)",
-            "-" * 70,
-            ""
-        ]
+        matrix_block = "\n".join(
+            "  [ " + "  ".join(f"{val:12.6f}" for val in row) + " ]" for row in matrix
+        )
+        created = calibration.created_at.strftime('%Y-%m-%d %H:%M:%S') if calibration.created_at else 'N/A'
         
-        # Format matrix
-        for row in matrix:
-            formatted_row = "  ".join(f"{val:12.6f}" for val in row)
-            lines.append(f"  [ {formatted_row} ]")
-        
-        lines.extend([
-            "",
-            "-" * 70,
-            "CALIBRATION METRICS",
-            "-" * 70,
-            f"  Reprojection Error:    {calibration.reprojection_error:.4f}",
-            f"  Rotation Error:        {calibration.rotation_error_deg:.4f} degrees",
-            f"  Translation Error:     {calibration.translation_error_mm:.4f} mm",
-            f"  Valid Poses:           {calibration.poses_valid}/{calibration.poses_processed}",
-            "",
-            "-" * 70,
-            "CHARUCO BOARD PARAMETERS",
-            "-" * 70,
-            f"  Squares (X x Y):       {calibration.charuco_squares_x} x {calibration.charuco_squares_y}",
-            f"  Square Length:         {calibration.charuco_square_length} mm",
-            f"  Marker Length:         {calibration.charuco_marker_length} mm",
-            f"  Dictionary:            {calibration.charuco_dictionary}",
-            "",
-            "=" * 70,
-            ""
-        ])
-        
-        return "\n".join(lines)
+        return f"""{_RULE_HEAVY}
+HAND-EYE CALIBRATION RESULTS
+{_RULE_HEAVY}
+
+Calibration Name: {calibration.name}
+ID: {calibration.id}
+Status: {calibration.status}
+Date: {created}
+Method: {calibration.method or 'Tsai-Lenz'}
+
+{_RULE_LIGHT}
+TRANSFORMATION MATRIX (Camera to End-Effector)
+{_RULE_LIGHT}
+
+{matrix_block}
+
+{_RULE_LIGHT}
+CALIBRATION METRICS
+{_RULE_LIGHT}
+  Reprojection Error:    {calibration.reprojection_error:.4f}
+  Rotation Error:        {calibration.rotation_error_deg:.4f} degrees
+  Translation Error:     {calibration.translation_error_mm:.4f} mm
+  Valid Poses:           {calibration.poses_valid}/{calibration.poses_processed}
+
+{_RULE_LIGHT}
+CHARUCO BOARD PARAMETERS
+{_RULE_LIGHT}
+  Squares (X x Y):       {calibration.charuco_squares_x} x {calibration.charuco_squares_y}
+  Square Length:         {calibration.charuco_square_length} mm
+  Marker Length:         {calibration.charuco_marker_length} mm
+  Dictionary:            {calibration.charuco_dictionary}
+
+{_RULE_HEAVY}
+"""
@@ -1,13 +1,81 @@
 import io
+import numpy as np
 from datetime import datetime
+from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
 
 from ..models.calibration import CalibrationRun
 
+# Reports are generated headless from trusted data: skip ReportLab's per-attribute shape validation
+rl_config.shapeChecking = 0
+rl_config.warnOnMissingFontGlyphs = 0
+
+# Load the standard-font metrics used by the report once at import, not during the first build
+_REPORT_FONTS = ('Helvetica', 'Helvetica-Bold', 'Courier')
+for _font_name in _REPORT_FONTS:
+    pdfmetrics.getFont(_font_name)
+
+# ReportLab styles are immutable once built: create them once per process, not per report
+_STYLES = getSampleStyleSheet()
+_PRIMARY = colors.HexColor('#a275c2')  # Primary Color
+
+_TITLE_STYLE = ParagraphStyle(
+    'Title',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    spaceAfter=30,
+    textColor=_PRIMARY
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'Heading',
+    parent=_STYLES['Heading2'],
+    fontSize=18,
+    spaceBefore=20,
+    spaceAfter=12,
+    textColor=colors.HexColor('#4a4a4a')
+)
+
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
+    ('TEXTCOLOR', (0,0), (0,-1), colors.HexColor('#555555')),
+    ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+    ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+])
+
+# Base commands of the metrics table; PASS/WARN/FAIL colors are added per report
+_METRIC_BASE_STYLE_CMDS = [
+    ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#f0f0f0')),
+    ('TEXTCOLOR', (0,0), (-1,0), colors.black),
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0,0), (-1,0), 12),
+    ('BOTTOMPADDING', (0,0), (-1,0), 12),
+    ('BACKGROUND', (0,1), (-1,-1), colors.white),
+    ('GRID', (0,0), (-1,-1), 1, colors.black),
+]
+
+_METRIC_STATUS_COLORS = {
+    "PASS": colors.green,
+    "WARN": colors.orange,
+    "FAIL": colors.red,
+}
+
+_MATRIX_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+    ('FONTNAME', (0,0), (-1,-1), 'Courier'),
+    ('BOX', (0,0), (-1,-1), 1, _PRIMARY),
+    ('INNERGRID', (0,0), (-1,-1), 0.25, colors.grey),
+    ('BACKGROUND', (0,0), (-1,-1), colors.HexColor('#fafafa')),
+    ('PADDING', (0,0), (-1,-1), 10),
+])
+
+
 class ReportService:
     @staticmethod
     def generate_calibration_report(calibration: CalibrationRun) -> bytes:
@@ -16,28 +84,12 @@ class ReportService:
         Returns the PDF content as bytes.
         """
         buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
+        doc = SimpleDocTemplate(buffer, pagesize=letter, _pageBreakQuick=1)
+        styles = _STYLES
+        title_style = _TITLE_STYLE
+        heading_style = _HEADING_STYLE
         story = []
 
-        # Custom Styles
-        title_style = ParagraphStyle(
-            'Title',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor('#a275c2')  # Primary Color
-        )
-        
-        heading_style = ParagraphStyle(
-            'Heading',
-            parent=styles['Heading2'],
-            fontSize=18,
-            spaceBefore=20,
-            spaceAfter=12,
-            textColor=colors.HexColor('#4a4a4a')
-        )
-
         # Header
         story.append(Paragraph("Reporte de Calibración Hand-Eye", title_style))
         story.append(Paragraph(f"Generado el: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
@@ -56,12 +108,7 @@ class ReportService:
         ]
         
         t_summary = Table(summary_data, colWidths=[2*inch, 4*inch])
-        t_summary.setStyle(TableStyle([
-            ('FONTNAME', (0,0), (0,-1), 'Helvetica-Bold'),
-            ('TEXTCOLOR', (0,0), (0,-1), colors.HexColor('#555555')),
-            ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-        ]))
+        t_summary.setStyle(_SUMMARY_TABLE_STYLE)
         story.append(t_summary)
         story.append(Spacer(1, 12))
 
@@ -83,28 +130,13 @@ class ReportService:
             
             t_metrics = Table(metrics_data, colWidths=[2.5*inch, 2*inch, 1.5*inch])
             
-            # Style for metrics table
-            metric_style = TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#f0f0f0')),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.black),
-                ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0,0), (-1,0), 12),
-                ('BOTTOMPADDING', (0,0), (-1,0), 12),
-                ('BACKGROUND', (0,1), (-1,-1), colors.white),
-                ('GRID', (0,0), (-1,-1), 1, colors.black),
+            # Style for metrics table, with color coding for PASS/WARN/FAIL
+            metric_style = TableStyle(_METRIC_BASE_STYLE_CMDS + [
+                ('TEXTCOLOR', (2,i), (2,i), _METRIC_STATUS_COLORS[row[2]])
+                for i, row in enumerate(metrics_data[1:], start=1)
+                if row[2] in _METRIC_STATUS_COLORS
             ])
             
-            # Color coding for PASS/WARN
-            for i, row in enumerate(metrics_data[1:], start=1):
-                status = row[2]
-                if status == "PASS":
-                    metric_style.add('TEXTCOLOR', (2,i), (2,i), colors.green)
-                elif status == "WARN":
-                    metric_style.add('TEXTCOLOR', (2,i), (2,i), colors.orange)
-                elif status == "FAIL":
-                    metric_style.add('TEXTCOLOR', (2,i), (2,i), colors.red)
-            
             t_metrics.setStyle(metric_style)
             story.append(t_metrics)
             story.append(Spacer(1, 20))
@@ -112,26 +144,13 @@ class ReportService:
             # Transformation Matrix Section
             story.append(Paragraph("Matriz de Transformación Resultante", heading_style))
             
-            if calibration.transformation_matrix:
+            if calibration.transformation_matrix is not None:
                 try:
-                    matrix = calibration.transformation_matrix
-                    # If it's a string (e.g. from legacy data), parse it
-                    if isinstance(matrix, str):
-                        import json
-                        matrix = json.loads(matrix)
-                    
-                    # Format matrix for display
-                    matrix_data = [[f"{val:.6f}" for val in row] for row in matrix]
+                    # The model decodes the matrix to a 4x4 ndarray: format it in C for display
+                    matrix_data = np.char.mod("%.6f", calibration.transformation_matrix).tolist()
                     
                     t_matrix = Table(matrix_data, colWidths=[1.5*inch]*4)
-                    t_matrix.setStyle(TableStyle([
-                        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-                        ('FONTNAME', (0,0), (-1,-1), 'Courier'),
-                        ('BOX', (0,0), (-1,-1), 1, colors.HexColor('#a275c2')),
-                        ('INNERGRID', (0,0), (-1,-1), 0.25, colors.grey),
-                        ('BACKGROUND', (0,0), (-1,-1), colors.HexColor('#fafafa')),
-                        ('PADDING', (0,0), (-1,-1), 10),
-                    ]))
+                    t_matrix.setStyle(_MATRIX_TABLE_STYLE)
                     story.append(t_matrix)
                 except:
                     story.append(Paragraph("Error al formatear la matriz.", styles['Normal']))
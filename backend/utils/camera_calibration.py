@@ -2,11 +2,24 @@
 Utility functions for parsing camera calibration files.
 Supports OpenCV YAML and JSON formats.
 """
-import json
+import orjson
 import yaml
 import numpy as np
 from typing import Dict, Optional, Tuple
 
+# Use the libyaml C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+# OpenCV distortion coefficient order
+DISTORTION_KEYS = ('k1', 'k2', 'p1', 'p2', 'k3')
+CAMERA_PARAM_KEYS = ('fx', 'fy', 'cx', 'cy') + DISTORTION_KEYS
+# Plausibility limit on |coefficient|, in the order the checks report them
+DISTORTION_LIMITS = (('k1', 5.0), ('k2', 5.0), ('k3', 5.0), ('p1', 5.0), ('p2', 5.0))
+
 
 def parse_opencv_yaml(file_content: str) -> Dict[str, any]:
     """
@@ -40,7 +53,7 @@ def parse_opencv_yaml(file_content: str) -> Dict[str, any]:
     """
     try:
         # Parse YAML
-        data = yaml.safe_load(file_content)
+        data = yaml.load(file_content, Loader=SafeLoader)
         
         # Extract camera matrix
         if 'camera_matrix' not in data:
@@ -108,7 +121,7 @@ def parse_opencv_json(file_content: str) -> Dict[str, any]:
         ValueError: If file format is invalid or required keys are missing
     """
     try:
-        data = json.loads(file_content)
+        data = orjson.loads(file_content)
         
         # Extract camera matrix
         if 'camera_matrix' not in data:
@@ -145,7 +158,7 @@ def parse_opencv_json(file_content: str) -> Dict[str, any]:
             'k3': float(k3)
         }
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON format: {e}")
     except (KeyError, IndexError, TypeError) as e:
         raise ValueError(f"Invalid camera calibration file structure: {e}")
@@ -161,10 +174,8 @@ def validate_camera_params(params: Dict[str, float]) -> Tuple[bool, str]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    required_keys = ['fx', 'fy', 'cx', 'cy', 'k1', 'k2', 'p1', 'p2', 'k3']
-    
     # Check all keys present
-    missing_keys = [k for k in required_keys if k not in params]
+    missing_keys = [k for k in CAMERA_PARAM_KEYS if k not in params]
     if missing_keys:
         return False, f"Missing parameters: {', '.join(missing_keys)}"
     
@@ -177,13 +188,10 @@ def validate_camera_params(params: Dict[str, float]) -> Tuple[bool, str]:
     
     # Distortion coefficients can be any value (including negative)
     # but should be reasonable (typically < 1.0 in absolute value)
-    for key in ['k1', 'k2', 'k3']:
-        if abs(params[key]) > 5.0:
-            return False, f"Distortion coefficient {key}={params[key]} seems unreasonably large (|value| > 5.0)"
-    
-    for key in ['p1', 'p2']:
-        if abs(params[key]) > 5.0:
-            return False, f"Distortion coefficient {key}={params[key]} seems unreasonably large (|value| > 5.0)"
+    for key, limit in DISTORTION_LIMITS:
+        value = params[key]
+        if abs(value) > limit:
+            return False, f"Distortion coefficient {key}={value} seems unreasonably large (|value| > {limit})"
     
     return True, ""
 
@@ -198,18 +206,15 @@ def params_to_opencv_format(params: Dict[str, float]) -> Tuple[np.ndarray, np.nd
     Returns:
         Tuple of (camera_matrix, dist_coeffs) as numpy arrays
     """
-    camera_matrix = np.array([
-        [params['fx'], 0, params['cx']],
-        [0, params['fy'], params['cy']],
-        [0, 0, 1]
-    ], dtype=np.float64)
+    camera_matrix = np.zeros((3, 3), dtype=np.float64)
+    camera_matrix[0, 0] = params['fx']
+    camera_matrix[1, 1] = params['fy']
+    camera_matrix[0, 2] = params['cx']
+    camera_matrix[1, 2] = params['cy']
+    camera_matrix[2, 2] = 1.0
     
-    dist_coeffs = np.array([
-        params['k1'],
-        params['k2'],
-        params['p1'],
-        params['p2'],
-        params['k3']
-    ], dtype=np.float64)
+    dist_coeffs = np.fromiter(
+        (params[key] for key in DISTORTION_KEYS), dtype=np.float64, count=len(DISTORTION_KEYS)
+    )
     
     return camera_matrix, dist_coeffs
@@ -1,14 +1,64 @@
 """
 ChArUco detection and visualization utilities.
 """
+import asyncio
 import cv2
 import numpy as np
+from concurrent.futures import Executor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Long-side limit for the detection pass; larger images are detected on a downscaled copy
+MAX_DETECTION_SIDE = 1600
+# Sub-pixel refinement of upscaled corners on the full-resolution image
+_SUBPIX_WINDOW = (5, 5)
+_SUBPIX_CRITERIA = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.01)
+# Encoder settings for JPEG annotated previews (far cheaper to encode than PNG deflate)
+_PREVIEW_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+# Long side of the gallery thumbnails (covers a grid card at 2x pixel density)
+THUMBNAIL_SIDE = 512
+_THUMBNAIL_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 75]
+# Decoder-side reductions (libjpeg DCT scaling), largest first
+_REDUCED_READ_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+@lru_cache(maxsize=32)
+def _get_detectors(
+    dictionary_name: str,
+    squares_x: int,
+    squares_y: int,
+    square_length: float,
+    marker_length: float
+) -> Tuple[cv2.aruco.ArucoDetector, cv2.aruco.CharucoDetector]:
+    """Build (and memoize per board configuration) the ArUco and ChArUco detectors."""
+    aruco_dict = cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, dictionary_name))
+    board = cv2.aruco.CharucoBoard((squares_x, squares_y), square_length, marker_length, aruco_dict)
+    aruco_detector = cv2.aruco.ArucoDetector(aruco_dict, cv2.aruco.DetectorParameters())
+    return aruco_detector, cv2.aruco.CharucoDetector(board)
+
+
+def _read_image(image_path: Path, image_size: Optional[Tuple[int, int]]) -> Tuple[Optional[np.ndarray], int]:
+    """
+    Decode an image, letting the decoder shrink it when it is much larger than the detection size.
+    
+    Returns:
+        Tuple of (image, reduction factor relative to the file's resolution)
+    """
+    if image_size and all(image_size):
+        long_side = max(image_size)
+        for factor, flag in _REDUCED_READ_FLAGS:
+            if long_side // factor >= MAX_DETECTION_SIDE:
+                return cv2.imread(str(image_path), flag), factor
+    return cv2.imread(str(image_path)), 1
+
 
 def detect_and_annotate_charuco(
     image_path: Path,
@@ -17,7 +67,9 @@ def detect_and_annotate_charuco(
     squares_y: int,
     square_length: float,
     marker_length: float,
-    dictionary_name: str = "DICT_5X5_100"
+    dictionary_name: str = "DICT_5X5_100",
+    image_size: Optional[Tuple[int, int]] = None,
+    thumbnail_path: Optional[Path] = None
 ) -> Tuple[bool, int, int]:
     """
     Detect ChArUco board in image and save annotated version.
@@ -30,44 +82,63 @@ def detect_and_annotate_charuco(
         square_length: Size of chessboard square (mm)
         marker_length: Size of ArUco marker (mm)
         dictionary_name: ArUco dictionary name
+        image_size: Known (width, height) of the image; when at least twice the detection
+            size, the image is decoded reduced and the annotated copy is saved at that size
+        thumbnail_path: Where to also save a small JPEG of the annotated image (optional)
     
     Returns:
         Tuple of (detected: bool, corners_count: int, ids_count: int, corners_data: list, ids_data: list)
     """
     try:
         # Load image
-        image = cv2.imread(str(image_path))
+        image, read_factor = _read_image(image_path, image_size)
         if image is None:
-            print(f"❌ Failed to load image: {image_path}")
-            logger.error(f"Failed to load image: {image_path}")
+            logger.error("Failed to load image: %s", image_path)
             return False, 0, 0, None, None
         
-        print(f"🔍 Processing image: {image_path}")
-        print(f"📐 Board config: {squares_x}x{squares_y} squares, square={square_length}mm, marker={marker_length}mm, dict={dictionary_name}")
-        print(f"✅ Expected corners: {(squares_x-1) * (squares_y-1)}")
-        
-        # Get ArUco dictionary
-        aruco_dict = cv2.aruco.getPredefinedDictionary(
-            getattr(cv2.aruco, dictionary_name)
+        logger.debug("Processing image: %s", image_path)
+        logger.debug(
+            "Board config: %dx%d squares, square=%smm, marker=%smm, dict=%s, expected corners=%d",
+            squares_x, squares_y, square_length, marker_length, dictionary_name,
+            (squares_x - 1) * (squares_y - 1)
         )
         
-        # Create ChArUco board
-        board = cv2.aruco.CharucoBoard(
-            (squares_x, squares_y),
-            square_length,
-            marker_length,
-            aruco_dict
+        # Detectors are reused across images of the same board configuration
+        aruco_detector, charuco_detector = _get_detectors(
+            dictionary_name, squares_x, squares_y, square_length, marker_length
         )
         
-        print(f"🎯 Board created: {board.getChessboardSize()}")
+        # Detection cost scales with pixel count: run it on a downscaled copy of large images
+        scale = min(1.0, MAX_DETECTION_SIDE / max(image.shape[:2]))
+        if scale < 1.0:
+            detection_image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            detection_image = image
+        
+        # Detect markers and ChArUco corners using modern API.
+        # All detection finishes before annotation, which draws on the decoded image in place
+        corners, ids, rejected = aruco_detector.detectMarkers(detection_image)
+        charuco_corners = charuco_ids = None
+        board_error = None
         
-        # Detect markers and ChArUco corners using modern API
-        detector_params = cv2.aruco.DetectorParameters()
-        aruco_detector = cv2.aruco.ArucoDetector(aruco_dict, detector_params)
-        corners, ids, rejected = aruco_detector.detectMarkers(image)
+        if ids is not None and len(ids) > 0:
+            # Use CharucoDetector for modern OpenCV (4.7+)
+            try:
+                charuco_corners, charuco_ids, marker_corners, marker_ids = charuco_detector.detectBoard(detection_image)
+                
+                if charuco_corners is not None and len(charuco_corners) > 0 and scale < 1.0:
+                    # Map corners back to the decoded resolution and recover the precision lost to downscaling
+                    charuco_corners = np.ascontiguousarray(charuco_corners / scale, dtype=np.float32)
+                    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                    cv2.cornerSubPix(gray, charuco_corners, _SUBPIX_WINDOW, (-1, -1), _SUBPIX_CRITERIA)
+            except Exception as e:
+                board_error = e
+            
+            if scale < 1.0:
+                corners = tuple(c / scale for c in corners)
         
-        # Create annotated image
-        annotated = image.copy()
+        # Annotate in place: the clean image is not needed after detection
+        annotated = image
         detected = False
         corners_count = 0
         ids_count = 0
@@ -76,22 +147,21 @@ def detect_and_annotate_charuco(
             # Draw detected markers
             cv2.aruco.drawDetectedMarkers(annotated, corners, ids)
             
-            print(f"📍 Detected {len(ids)} ArUco markers")
+            logger.debug("Detected %d ArUco markers", len(ids))
             
-            # Use CharucoDetector for modern OpenCV (4.7+)
             try:
-                charuco_detector = cv2.aruco.CharucoDetector(board)
-                charuco_corners, charuco_ids, marker_corners, marker_ids = charuco_detector.detectBoard(image)
+                if board_error is not None:
+                    raise board_error
                 
                 if charuco_corners is not None and len(charuco_corners) > 0:
                     detected = True
                     corners_count = len(charuco_corners)
                     ids_count = len(charuco_ids) if charuco_ids is not None else 0
                     
-                    print(f"✅ FINAL: detected={detected}, corners_count={corners_count}, ids_count={ids_count}")
+                    logger.debug("ChArUco corners: %d, ids: %d", corners_count, ids_count)
                     
-                    # Convert numpy arrays to Python lists for JSON serialization
-                    corners_data = charuco_corners.reshape(-1, 2).tolist() if charuco_corners is not None else None
+                    # Convert numpy arrays to Python lists for JSON serialization (file resolution coordinates)
+                    corners_data = (charuco_corners.reshape(-1, 2) * read_factor).tolist()
                     ids_data = charuco_ids.flatten().tolist() if charuco_ids is not None else None
                     
                     # Draw ChArUco corners
@@ -106,7 +176,7 @@ def detect_and_annotate_charuco(
                     text = "ArUco markers found, ChArUco interpolation failed"
                     cv2.putText(annotated, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
             except Exception as e:
-                print(f"⚠️  CharucoDetector failed: {e}, corners will not be detected")
+                logger.warning("CharucoDetector failed: %s, corners will not be detected", e)
                 text = f"Error: {str(e)[:50]}"
                 cv2.putText(annotated, text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
         else:
@@ -116,11 +186,39 @@ def detect_and_annotate_charuco(
         
         # Save annotated image
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        cv2.imwrite(str(output_path), annotated)
+        if output_path.suffix.lower() in ('.jpg', '.jpeg'):
+            cv2.imwrite(str(output_path), annotated, _PREVIEW_JPEG_PARAMS)
+        else:
+            cv2.imwrite(str(output_path), annotated)
+        
+        if thumbnail_path is not None:
+            # Downscale the already-annotated image: the gallery never needs full resolution
+            thumb_scale = min(1.0, THUMBNAIL_SIDE / max(annotated.shape[:2]))
+            thumbnail = cv2.resize(annotated, None, fx=thumb_scale, fy=thumb_scale, interpolation=cv2.INTER_AREA)
+            thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(str(thumbnail_path), thumbnail, _THUMBNAIL_JPEG_PARAMS)
         
-        logger.info(f"ChArUco detection: detected={detected}, corners={corners_count}, ids={ids_count}")
+        logger.info("ChArUco detection: detected=%s, corners=%d, ids=%d", detected, corners_count, ids_count)
         return detected, corners_count, ids_count, corners_data, ids_data
         
     except Exception as e:
-        logger.error(f"Error in ChArUco detection: {e}")
+        logger.error("Error in ChArUco detection: %s", e)
         return False, 0, 0, None, None
+
+
+async def detect_and_annotate_batch(executor: Executor, jobs: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Run detect_and_annotate_charuco for several images concurrently on an executor.
+    
+    Args:
+        executor: Pool the detections run on (the app's process pool)
+        jobs: Keyword arguments of detect_and_annotate_charuco, one dict per image
+    
+    Returns:
+        One result per job, in job order; an exception instance if a job could not run
+    """
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(executor, partial(detect_and_annotate_charuco, **job)) for job in jobs),
+        return_exceptions=True
+    )
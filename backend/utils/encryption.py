@@ -1,39 +1,113 @@
 import os
+import threading
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from backend.config import settings
 import base64
 
 # Seguridad A02: Cifrado AES-256-GCM para datos sensibles en reposo
 
+# HKDF domain separation: a SECRET_KEY shared with JWT signing yields an unrelated AES key
+_HKDF_SALT = b"app-aes-gcm-v1"
+_HKDF_INFO = b"encryption-service"
+
+
+def _derive_key(secret: str) -> bytes:
+    # Derive the 32-byte AES-256 key from SECRET_KEY with HKDF-SHA256
+    # In production, this should be a separate key
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=_HKDF_SALT,
+        info=_HKDF_INFO,
+    ).derive(secret.encode())
+
+
+def _derive_legacy_key(secret: str) -> bytes:
+    # Pre-HKDF key: SECRET_KEY bytes padded/truncated to 32 (only kept to read old ciphertext)
+    key_material = secret.encode()
+    if len(key_material) < 32:
+        key_material = key_material.ljust(32, b'0')
+    return key_material[:32]
+
+
+# Key and cipher are fixed for the process lifetime: derive and build them once at import
+_KEY = _derive_key(settings.SECRET_KEY)
+_AESGCM = AESGCM(_KEY)
+# Fallback for values encrypted before the HKDF key (see scripts/migrate_reencrypt_hkdf_key.py)
+_LEGACY_AESGCM = AESGCM(_derive_legacy_key(settings.SECRET_KEY))
+
+
+NONCE_SIZE = 12
+# Nonces are sliced from one getrandom() buffer instead of one syscall per encryption
+_NONCE_POOL_SIZE = NONCE_SIZE * 1024
+
+
 class EncryptionService:
-    _key = None
+    _nonce_lock = threading.Lock()
+    _nonce_pool = b""
+    _nonce_off = 0
+    _nonce_pid = None
 
     @classmethod
     def get_key(cls):
-        if cls._key is None:
-            # Use SECRET_KEY to derive a 32-byte key for AES-256
-            # In production, this should be a separate key
-            key_material = settings.SECRET_KEY.encode()
-            if len(key_material) < 32:
-                # Pad if too short (not ideal but works for demo)
-                key_material = key_material.ljust(32, b'0')
-            cls._key = key_material[:32]
-        return cls._key
+        return _KEY
 
     @classmethod
-    def encrypt(cls, plaintext: str) -> str:
-        """Encrypt string using AES-256-GCM."""
+    def get_cipher(cls) -> AESGCM:
+        """AES-GCM cipher for the derived key, shared by all calls."""
+        return _AESGCM
+
+    @classmethod
+    def _next_nonce(cls) -> bytes:
+        """Take the next unused 12-byte nonce from the random pool, refilling it when depleted."""
+        with cls._nonce_lock:
+            # A forked worker inherits the parent's pool: never hand out the same nonces twice
+            if cls._nonce_off >= len(cls._nonce_pool) or cls._nonce_pid != os.getpid():
+                cls._nonce_pool = os.urandom(_NONCE_POOL_SIZE)
+                cls._nonce_off = 0
+                cls._nonce_pid = os.getpid()
+            nonce = cls._nonce_pool[cls._nonce_off:cls._nonce_off + NONCE_SIZE]
+            cls._nonce_off += NONCE_SIZE
+        return nonce
+
+    @classmethod
+    def encrypt_bytes(cls, plaintext: str) -> bytes:
+        """Encrypt string using AES-256-GCM, returning raw nonce + ciphertext (for BLOB columns)."""
         if not plaintext:
             return None
         
-        aesgcm = AESGCM(cls.get_key())
-        nonce = os.urandom(12)
-        data = plaintext.encode()
+        nonce = cls._next_nonce()
+        return nonce + _AESGCM.encrypt(nonce, plaintext.encode(), None)
+
+    @classmethod
+    def decrypt_bytes(cls, raw: bytes) -> str:
+        """Decrypt raw nonce + ciphertext produced by encrypt_bytes."""
+        if not raw:
+            return None
         
-        ciphertext = aesgcm.encrypt(nonce, data, None)
+        nonce = raw[:NONCE_SIZE]
+        ciphertext = raw[NONCE_SIZE:]
+        try:
+            try:
+                plaintext = _AESGCM.decrypt(nonce, ciphertext, None)
+            except InvalidTag:
+                plaintext = _LEGACY_AESGCM.decrypt(nonce, ciphertext, None)
+            return plaintext.decode('utf-8')
+        except Exception:
+            return None
+
+    @classmethod
+    def encrypt(cls, plaintext: str) -> str:
+        """Encrypt string using AES-256-GCM, returned as base64 text."""
+        raw = cls.encrypt_bytes(plaintext)
+        if raw is None:
+            return None
         
         # Return as base64: nonce + ciphertext
-        return base64.b64encode(nonce + ciphertext).decode('utf-8')
+        return base64.b64encode(raw).decode('utf-8')
 
     @classmethod
     def decrypt(cls, ciphertext_b64: str) -> str:
@@ -43,11 +117,6 @@ class EncryptionService:
             
         try:
             raw = base64.b64decode(ciphertext_b64)
-            nonce = raw[:12]
-            ciphertext = raw[12:]
-            
-            aesgcm = AESGCM(cls.get_key())
-            plaintext = aesgcm.decrypt(nonce, ciphertext, None)
-            return plaintext.decode('utf-8')
         except Exception:
             return None
+        return cls.decrypt_bytes(raw)
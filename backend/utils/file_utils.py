@@ -1,16 +1,37 @@
 """
 File handling utilities for calibration images and CSV files.
 """
+import asyncio
 import os
-import csv
 import io
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Union
+import aiofiles
+import numpy as np
+import pandas as pd
+from PIL import Image, UnidentifiedImageError
 from fastapi import UploadFile, HTTPException
 from backend.config import settings
 
+# Uploads are copied to disk in chunks of this size instead of being read whole
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
 
-def validate_image_file(file: UploadFile) -> bool:
+POSE_FIELDS = ('x', 'y', 'z', 'rx', 'ry', 'rz')
+# Accepted robot pose CSV headers per pose field, in lookup order; a row falls
+# back to the next header when a cell is empty, so the variants can be mixed.
+# KUKA: A is rotation around Z, B is around Y, C is around X.
+POSE_CSV_HEADERS = {
+    'x': ('X', 'x'),
+    'y': ('Y', 'y'),
+    'z': ('Z', 'z'),
+    'rx': ('C', 'rx'),
+    'ry': ('B', 'ry'),
+    'rz': ('A', 'rz'),
+}
+
+
+def validate_image_file(file: UploadFile) -> str:
     """
     Validate that uploaded file is a valid image.
     
@@ -18,7 +39,7 @@ def validate_image_file(file: UploadFile) -> bool:
         file: Uploaded file
         
     Returns:
-        True if valid
+        Lowercase file extension (e.g. '.png'), truthy when valid
         
     Raises:
         HTTPException: If file is invalid
@@ -40,14 +61,15 @@ def validate_image_file(file: UploadFile) -> bool:
                 detail=f"File too large. Maximum size: {settings.MAX_IMAGE_SIZE_MB} MB"
             )
     
-    return True
+    return ext
 
 
 async def save_uploaded_image(
     file: UploadFile,
     calibration_id: int,
     pose_index: int,
-    upload_dir: Path = None
+    upload_dir: Path = None,
+    ext: str = None
 ) -> Path:
     """
     Save uploaded image to disk with structured filename and directory.
@@ -57,6 +79,7 @@ async def save_uploaded_image(
         calibration_id: ID of calibration run
         pose_index: Index of pose (for filename)
         upload_dir: Base upload directory (default: from settings)
+        ext: Extension already returned by validate_image_file (default: from file.filename)
         
     Returns:
         Relative path to saved file
@@ -69,24 +92,72 @@ async def save_uploaded_image(
     calib_dir.mkdir(parents=True, exist_ok=True)
     
     # Generate filename
-    ext = Path(file.filename).suffix.lower()
+    if ext is None:
+        ext = Path(file.filename).suffix.lower()
     filename = f"img_{pose_index:02d}{ext}"
     filepath = calib_dir / filename
     
-    # Save file
-    contents = await file.read()
-    with open(filepath, "wb") as f:
-        f.write(contents)
+    # Stream file to disk, enforcing the size cap as chunks arrive
+    # (the upload may not declare its size up front)
+    max_size_bytes = settings.MAX_IMAGE_SIZE_MB * 1024 * 1024
+    written = 0
+    async with aiofiles.open(filepath, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            written += len(chunk)
+            if written > max_size_bytes:
+                break
+            await f.write(chunk)
+    
+    if written > max_size_bytes:
+        filepath.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size: {settings.MAX_IMAGE_SIZE_MB} MB"
+        )
     
     # Return relative path (relative to project root)
     return filepath
 
 
+async def save_many(
+    files: List[UploadFile],
+    calibration_id: int,
+    first_pose_index: int,
+    upload_dir: Path = None
+) -> List[Union[Path, Exception]]:
+    """
+    Validate and save several uploaded images concurrently.
+    
+    At most settings.UPLOAD_CONCURRENCY files are streamed at a time, so memory stays
+    bounded by concurrency x chunk size whatever the batch size.
+    
+    Args:
+        files: Uploaded files, saved with consecutive pose indices
+        calibration_id: ID of calibration run
+        first_pose_index: Pose index of the first file
+        upload_dir: Base upload directory (default: from settings)
+        
+    Returns:
+        One entry per file, in order: the saved path, or the exception that rejected it
+    """
+    semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+    
+    async def save_one(pose_index: int, file: UploadFile) -> Path:
+        async with semaphore:
+            ext = validate_image_file(file)
+            return await save_uploaded_image(file, calibration_id, pose_index, upload_dir, ext=ext)
+    
+    return await asyncio.gather(
+        *(save_one(idx, file) for idx, file in enumerate(files, start=first_pose_index)),
+        return_exceptions=True
+    )
+
+
 def parse_robot_poses_csv(file_content: bytes) -> List[Dict]:
     """
     Parse CSV file containing robot poses.
     
-    Supports headers:
+    Supports headers (per column, so the two sets can be mixed):
     - X,Y,Z,A,B,C (uppercase)
     - x,y,z,rx,ry,rz (lowercase)
     
@@ -99,29 +170,24 @@ def parse_robot_poses_csv(file_content: bytes) -> List[Dict]:
     Raises:
         HTTPException: If CSV is invalid
     """
-    # Decode content
+    # Header names only (CSV quoting applies, e.g. "X","Y","Z")
     try:
-        content_str = file_content.decode('utf-8')
+        header = set(pd.read_csv(
+            io.BytesIO(file_content),
+            nrows=0,
+            encoding='utf-8',
+            skipinitialspace=True
+        ).columns)
     except UnicodeDecodeError:
         raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
-    
-    # Parse CSV
-    reader = csv.DictReader(io.StringIO(content_str))
-    
-    if not reader.fieldnames:
+    except pd.errors.EmptyDataError:
         raise HTTPException(status_code=400, detail="CSV file is empty")
-    
-    # Map headers (support both X,Y,Z,A,B,C and x,y,z,rx,ry,rz)
-    header_mappings = {
-        'X': 'x', 'Y': 'y', 'Z': 'z',
-        'A': 'rx', 'B': 'ry', 'C': 'rz',
-        'x': 'x', 'y': 'y', 'z': 'z',
-        'rx': 'rx', 'ry': 'ry', 'rz': 'rz'
-    }
+    except (ValueError, pd.errors.ParserError) as e:
+        raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
     
     # Check required headers
-    has_position = any(h in reader.fieldnames for h in ['X', 'x'])
-    has_rotation = any(h in reader.fieldnames for h in ['A', 'rx'])
+    has_position = any(h in header for h in ['X', 'x'])
+    has_rotation = any(h in header for h in ['A', 'rx'])
     
     if not (has_position and has_rotation):
         raise HTTPException(
@@ -129,32 +195,56 @@ def parse_robot_poses_csv(file_content: bytes) -> List[Dict]:
             detail="CSV must have position (X,Y,Z or x,y,z) and rotation (A,B,C or rx,ry,rz) columns"
         )
     
-    # KUKA: A is rotation around Z, B is around Y, C is around X.
-    poses = []
-    for idx, row in enumerate(reader, start=1):
-        try:
-            pose = {
-                'pose_index': idx,
-                'x': float(row.get('X') or row.get('x')),
-                'y': float(row.get('Y') or row.get('y')),
-                'z': float(row.get('Z') or row.get('z')),
-                'rx': float(row.get('C') or row.get('rx')), # C is rotation around X
-                'ry': float(row.get('B') or row.get('ry')), # B is rotation around Y
-                'rz': float(row.get('A') or row.get('rz'))  # A is rotation around Z
-            }
-            poses.append(pose)
-        except (ValueError, TypeError, KeyError) as e:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Error parsing row {idx}: {str(e)}"
-            )
+    # Parse all rows in pandas' C engine
+    usecols = [h for headers in POSE_CSV_HEADERS.values() for h in headers if h in header]
+    try:
+        raw = pd.read_csv(
+            io.BytesIO(file_content),
+            usecols=usecols,
+            dtype=np.float64,
+            encoding='utf-8',
+            skipinitialspace=True
+        )
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    except (ValueError, pd.errors.ParserError) as e:
+        raise HTTPException(status_code=400, detail=f"Error parsing CSV: {str(e)}")
     
-    if len(poses) == 0:
+    if len(raw) == 0:
         raise HTTPException(status_code=400, detail="CSV file contains no data rows")
     
+    # Each field from its first non-empty header
+    df = pd.DataFrame(index=raw.index)
+    for field, headers in POSE_CSV_HEADERS.items():
+        column = pd.Series(np.nan, index=raw.index)
+        for h in reversed(headers):
+            if h in raw:
+                column = raw[h].fillna(column)
+        df[field] = column
+    
+    missing = df.isna().to_numpy().any(axis=1)
+    if missing.any():
+        row = int(np.argmax(missing))
+        field = df.columns[int(np.argmax(df.iloc[row].isna().to_numpy()))]
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error parsing row {row + 1}: missing value for {field} "
+                   f"({' or '.join(POSE_CSV_HEADERS[field])})"
+        )
+    
+    df.insert(0, 'pose_index', np.arange(1, len(df) + 1, dtype=np.int64))
+    poses = df.to_dict(orient="records")
+    
     return poses
 
 
+@lru_cache(maxsize=1)
+def _cv2():
+    """OpenCV module, imported on first use only (Pillow handles the common formats)."""
+    import cv2
+    return cv2
+
+
 def get_image_dimensions(filepath: Path) -> tuple:
     """
     Get image dimensions without loading full image.
@@ -166,12 +256,22 @@ def get_image_dimensions(filepath: Path) -> tuple:
         Tuple of (width, height) or (None, None) if unable to determine
     """
     try:
-        import cv2
-        img = cv2.imread(str(filepath))
-        if img is not None:
-            height, width = img.shape[:2]
-            return width, height
-    except:
+        # Image.open only parses the header; pixel data is never decoded
+        with Image.open(filepath) as img:
+            return img.size
+    except UnidentifiedImageError:
         pass
+    except OSError:
+        return None, None
+    
+    # Format Pillow does not recognize: fall back to a full OpenCV decode
+    cv2 = _cv2()
+    try:
+        img = cv2.imread(str(filepath))
+    except cv2.error:
+        img = None
+    if img is not None:
+        height, width = img.shape[:2]
+        return width, height
     
     return None, None
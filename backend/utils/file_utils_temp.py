@@ -1,3 +0,0 @@
-"""
-Utility package for backend helpers.
-"""
@@ -37,5 +37,5 @@ app.add_page(create_calibration_page, route="/calibration/new")
 app.add_page(images_page, route="/calibration/[calibration_id]/images", on_load=CalibrationState.load_calibration)
 app.add_page(poses_page, route="/calibration/[calibration_id]/poses", on_load=CalibrationState.load_calibration)
 app.add_page(execute_page, route="/calibration/[calibration_id]/execute", on_load=CalibrationState.load_calibration)
-app.add_page(results_page, route="/calibration/[calibration_id]/results", on_load=CalibrationState.load_calibration)
+app.add_page(results_page, route="/calibration/[calibration_id]/results", on_load=CalibrationState.load_results)
 app.add_page(settings_page, route="/settings")
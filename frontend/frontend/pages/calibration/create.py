@@ -1,8 +1,29 @@
 import reflex as rx
 from .state import CalibrationState
 from ...components.layout import layout
-from ...styles import ColorPalette, BUTTON_STYLE, INPUT_STYLE, CARD_STYLE
+from ...styles import ColorPalette, BUTTON_STYLE, INPUT_STYLE, CARD_STYLE, PRIMARY_BORDER, BACK_BUTTON_HOVER
 
+
+@rx.memo
+def num_field(
+    label: rx.Var[str],
+    value: rx.Var[str],
+    on_change: rx.EventHandler[rx.event.passthrough_event_spec(str)],
+) -> rx.Component:
+    """Labeled numeric input, compiled once and re-rendered only when its own value changes."""
+    return rx.vstack(
+        rx.text(label, size="2", weight="bold"),
+        rx.input(
+            value=value,
+            on_change=on_change,
+            type="number",
+            style=INPUT_STYLE
+        )
+    )
+
+
+# Prop-less page: memoized so React reuses the subtree instead of rebuilding it
+@rx.memo
 def create_calibration_page() -> rx.Component:
     return layout(
         rx.center(
@@ -13,9 +34,9 @@ def create_calibration_page() -> rx.Component:
                         on_click=rx.redirect("/"),
                         variant="outline",
                         color=ColorPalette.PRIMARY,
-                        border=f"1px solid {ColorPalette.PRIMARY}",
+                        border=PRIMARY_BORDER,
                         size="2",
-                        _hover={"background": ColorPalette.PRIMARY, "color": "white"},
+                        _hover=BACK_BUTTON_HOVER,
                     ),
                     rx.heading("Nueva Calibración", size="6", color=ColorPalette.PRIMARY),
                     width="100%",
@@ -26,20 +47,28 @@ def create_calibration_page() -> rx.Component:
                 
                 rx.box(
                     rx.vstack(
+                        # Free-text fields are uncontrolled, so they are debounced explicitly
+                        # (one state event per pause instead of one per keystroke)
                         rx.text("Nombre", weight="bold"),
-                        rx.input(
-                            placeholder="Ej: Calibración Robot 1",
-                            on_change=CalibrationState.set_new_cal_name,
-                            style=INPUT_STYLE,
-                            width="100%"
+                        rx.debounce_input(
+                            rx.input(
+                                placeholder="Ej: Calibración Robot 1",
+                                on_change=CalibrationState.set_new_cal_name,
+                                style=INPUT_STYLE,
+                                width="100%"
+                            ),
+                            debounce_timeout=300,
                         ),
                         
                         rx.text("Descripción", weight="bold"),
-                        rx.text_area(
-                            placeholder="Detalles opcionales...",
-                            on_change=CalibrationState.set_new_cal_desc,
-                            style=INPUT_STYLE,
-                            width="100%"
+                        rx.debounce_input(
+                            rx.text_area(
+                                placeholder="Detalles opcionales...",
+                                on_change=CalibrationState.set_new_cal_desc,
+                                style=INPUT_STYLE,
+                                width="100%"
+                            ),
+                            debounce_timeout=500,
                         ),
                         
                         rx.divider(),
@@ -95,107 +124,83 @@ def create_calibration_page() -> rx.Component:
                         
                         rx.divider(),
                         
-                        # Camera Parameters Section (Required)
-                        rx.heading("Parámetros de Cámara", size="4"),
-                        rx.text(
-                            "Parámetros intrínsecos de calibración de la cámara",
-                            color="gray",
-                            size="2"
-                        ),
+                        # Camera Parameters Section: prefilled with defaults, collapsed until needed
+                        # (the inputs are only mounted when the panel is opened)
+                        rx.accordion.root(
+                            rx.accordion.item(
+                                header="Parámetros de Cámara (avanzado)",
+                                content=rx.vstack(
+                                    rx.text(
+                                        "Parámetros intrínsecos de calibración de la cámara",
+                                        color="gray",
+                                        size="2"
+                                    ),
                         
-                        rx.heading("Matriz Intrínseca", size="3", margin_top="3"),
-                        rx.grid(
-                            rx.vstack(
-                                rx.text("fx (Focal X)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_fx.to_string(),
-                                    on_change=CalibrationState.set_camera_fx,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            rx.vstack(
-                                rx.text("fy (Focal Y)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_fy.to_string(),
-                                    on_change=CalibrationState.set_camera_fy,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            rx.vstack(
-                                rx.text("cx (Centro X)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_cx.to_string(),
-                                    on_change=CalibrationState.set_camera_cx,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            rx.vstack(
-                                rx.text("cy (Centro Y)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_cy.to_string(),
-                                    on_change=CalibrationState.set_camera_cy,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            columns="2",
-                            spacing="3",
-                            width="100%"
-                        ),
+                                    rx.heading("Matriz Intrínseca", size="3", margin_top="3"),
+                                    rx.grid(
+                                        num_field(
+                                            label="fx (Focal X)",
+                                            value=CalibrationState.camera_fx.to_string(),
+                                            on_change=CalibrationState.set_camera_fx
+                                        ),
+                                        num_field(
+                                            label="fy (Focal Y)",
+                                            value=CalibrationState.camera_fy.to_string(),
+                                            on_change=CalibrationState.set_camera_fy
+                                        ),
+                                        num_field(
+                                            label="cx (Centro X)",
+                                            value=CalibrationState.camera_cx.to_string(),
+                                            on_change=CalibrationState.set_camera_cx
+                                        ),
+                                        num_field(
+                                            label="cy (Centro Y)",
+                                            value=CalibrationState.camera_cy.to_string(),
+                                            on_change=CalibrationState.set_camera_cy
+                                        ),
+                                        columns="2",
+                                        spacing="3",
+                                        width="100%"
+                                    ),
                         
-                        rx.heading("Coeficientes de Distorsión", size="3", margin_top="3"),
-                        rx.grid(
-                            rx.vstack(
-                                rx.text("k1 (Radial)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_k1.to_string(),
-                                    on_change=CalibrationState.set_camera_k1,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            rx.vstack(
-                                rx.text("k2 (Radial)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_k2.to_string(),
-                                    on_change=CalibrationState.set_camera_k2,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
+                                    rx.heading("Coeficientes de Distorsión", size="3", margin_top="3"),
+                                    rx.grid(
+                                        num_field(
+                                            label="k1 (Radial)",
+                                            value=CalibrationState.camera_k1.to_string(),
+                                            on_change=CalibrationState.set_camera_k1
+                                        ),
+                                        num_field(
+                                            label="k2 (Radial)",
+                                            value=CalibrationState.camera_k2.to_string(),
+                                            on_change=CalibrationState.set_camera_k2
+                                        ),
+                                        num_field(
+                                            label="p1 (Tangencial)",
+                                            value=CalibrationState.camera_p1.to_string(),
+                                            on_change=CalibrationState.set_camera_p1
+                                        ),
+                                        num_field(
+                                            label="p2 (Tangencial)",
+                                            value=CalibrationState.camera_p2.to_string(),
+                                            on_change=CalibrationState.set_camera_p2
+                                        ),
+                                        num_field(
+                                            label="k3 (Radial)",
+                                            value=CalibrationState.camera_k3.to_string(),
+                                            on_change=CalibrationState.set_camera_k3
+                                        ),
+                                        columns="2",
+                                        spacing="3",
+                                        width="100%"
+                                    ),
+                                    spacing="4",
+                                    align_items="stretch",
+                                ),
                             ),
-                            rx.vstack(
-                                rx.text("p1 (Tangencial)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_p1.to_string(),
-                                    on_change=CalibrationState.set_camera_p1,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            rx.vstack(
-                                rx.text("p2 (Tangencial)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_p2.to_string(),
-                                    on_change=CalibrationState.set_camera_p2,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            rx.vstack(
-                                rx.text("k3 (Radial)", size="2", weight="bold"),
-                                rx.input(
-                                    value=CalibrationState.camera_k3.to_string(),
-                                    on_change=CalibrationState.set_camera_k3,
-                                    type="number",
-                                    style=INPUT_STYLE
-                                )
-                            ),
-                            columns="2",
-                            spacing="3",
-                            width="100%"
+                            type="single",
+                            collapsible=True,
+                            width="100%",
                         ),
                         
                         rx.button(
@@ -1,8 +1,10 @@
 import reflex as rx
 from .state import CalibrationState
 from ...components.layout import layout
-from ...styles import ColorPalette, BUTTON_STYLE, CARD_STYLE
+from ...styles import ColorPalette, BUTTON_STYLE, CARD_STYLE, PRIMARY_BORDER, BACK_BUTTON_HOVER
 
+# Prop-less page: memoized so React reuses the subtree instead of rebuilding it
+@rx.memo
 def execute_page() -> rx.Component:
     return layout(
         rx.vstack(
@@ -12,9 +14,9 @@ def execute_page() -> rx.Component:
                     on_click=rx.redirect(f"/calibration/{CalibrationState.current_calibration_id}/poses"),
                     variant="outline",
                     color=ColorPalette.PRIMARY,
-                    border=f"1px solid {ColorPalette.PRIMARY}",
+                    border=PRIMARY_BORDER,
                     size="2",
-                    _hover={"background": ColorPalette.PRIMARY, "color": "white"},
+                    _hover=BACK_BUTTON_HOVER,
                 ),
                 rx.heading("Paso 3: Ejecutar Calibración", size="6", color=ColorPalette.PRIMARY),
                 rx.spacer(),
@@ -30,15 +32,15 @@ def execute_page() -> rx.Component:
                         rx.heading("Resumen de Datos", size="4"),
                         rx.hstack(
                             rx.text("Imágenes:", weight="bold"),
-                            rx.text(f"{CalibrationState.images.length()}"),
+                            rx.text(f"{CalibrationState.num_images}"),
                         ),
                         rx.hstack(
                             rx.text("Poses Robot:", weight="bold"),
-                            rx.text(f"{CalibrationState.poses.length()}"),
+                            rx.text(f"{CalibrationState.num_poses}"),
                         ),
                         rx.divider(),
                         rx.cond(
-                            CalibrationState.images.length() == CalibrationState.poses.length(),
+                            CalibrationState.is_data_synced,
                             rx.badge("Datos Sincronizados", color_scheme="green"),
                             rx.badge("Desajuste de Datos", color_scheme="red"),
                         ),
@@ -71,11 +73,7 @@ def execute_page() -> rx.Component:
                 size="4",
                 width="100%",
                 margin_top="6",
-                is_disabled=rx.cond(
-                    (CalibrationState.images.length() > 0) & 
-                    (CalibrationState.images.length() == CalibrationState.poses.length()),
-                    False, True
-                ),
+                is_disabled=rx.cond(CalibrationState.is_data_synced, False, True),
             ),
             
             spacing="6",
@@ -1,8 +1,50 @@
 import reflex as rx
+from typing import Any, Dict
 from .state import CalibrationState
 from ...components.layout import layout
-from ...styles import ColorPalette, BUTTON_STYLE, CARD_STYLE
+from ...styles import ColorPalette, BUTTON_STYLE, CARD_STYLE, PRIMARY_BORDER, DASHED_ACCENT_BORDER, BACK_BUTTON_HOVER
 
+
+# Upload event spec, bound once at import instead of rebuilt inside the page function
+_UPLOAD_IMAGES_EVENT = CalibrationState.upload_files(rx.upload_files("upload_images"))
+
+
+@rx.memo
+def image_card(img: rx.Var[Dict[str, Any]]) -> rx.Component:
+    """Uploaded image preview with its detection badge; re-renders only when its own image changes."""
+    return rx.box(
+        rx.image(
+            # Preview URL (thumbnail, else annotated image) is resolved by CalibrationState
+            src=img["display_url"].to(str),
+            width="100%", 
+            height="auto", 
+            border_radius="md",
+            alt=img['original_filename'],
+            # Full-resolution captures: fetch only when scrolled near, decode off the main thread
+            loading="lazy",
+            decoding="async",
+        ),
+        rx.hstack(
+            rx.text(img['original_filename'], size="1", color=ColorPalette.GRAY_600),
+            rx.cond(
+                img["charuco_detected"],
+                rx.badge(img["corners_label"], color_scheme="green", size="1"),
+                rx.badge("✗ No detectado", color_scheme="red", size="1"),
+            ),
+            spacing="2",
+            justify="between",
+            width="100%",
+            margin_top="2",
+        ),
+        style=CARD_STYLE,
+        # Off-screen cards skip layout and paint until scrolled into view
+        content_visibility="auto",
+        contain_intrinsic_size="auto 300px",
+    )
+
+
+# Prop-less page: memoized so React reuses the subtree instead of rebuilding it
+@rx.memo
 def images_page() -> rx.Component:
     return layout(
         rx.vstack(
@@ -12,9 +54,9 @@ def images_page() -> rx.Component:
                     on_click=rx.redirect("/"),
                     variant="outline",
                     color=ColorPalette.PRIMARY,
-                    border=f"1px solid {ColorPalette.PRIMARY}",
+                    border=PRIMARY_BORDER,
                     size="2",
-                    _hover={"background": ColorPalette.PRIMARY, "color": "white"},
+                    _hover=BACK_BUTTON_HOVER,
                 ),
                 rx.heading("Paso 1: Cargar Imágenes", size="6", color=ColorPalette.PRIMARY),
                 rx.spacer(),
@@ -32,11 +74,11 @@ def images_page() -> rx.Component:
             
             rx.upload(
                 rx.vstack(
-                    rx.button("Seleccionar Imágenes", color=ColorPalette.PRIMARY, bg="white", border=f"1px solid {ColorPalette.PRIMARY}"),
+                    rx.button("Seleccionar Imágenes", color=ColorPalette.PRIMARY, bg="white", border=PRIMARY_BORDER),
                     rx.text("Arrastra y suelta archivos aquí", size="2", color="gray"),
                 ),
                 id="upload_images",
-                border=f"1px dashed {ColorPalette.ACCENT}",
+                border=DASHED_ACCENT_BORDER,
                 padding="10",
                 border_radius="lg",
                 multiple=True,
@@ -44,57 +86,25 @@ def images_page() -> rx.Component:
                 max_files=20,
             ),
             
-            rx.hstack(
-                rx.foreach(
-                    rx.selected_files("upload_images"),
-                    lambda file: rx.badge(file, color_scheme="purple")
-                ),
-                wrap="wrap",
-                spacing="2",
-            ),
+            # Files about to be uploaded, as one line of text rather than one badge per file
+            rx.text(rx.selected_files("upload_images").join(", "), size="2", color="gray"),
             
             rx.button(
                 "Subir Archivos Seleccionados",
-                on_click=CalibrationState.upload_files(rx.upload_files("upload_images")),
+                on_click=_UPLOAD_IMAGES_EVENT,
                 style=BUTTON_STYLE,
             ),
             
             rx.divider(),
             
-            rx.heading(f"Imágenes Subidas ({CalibrationState.images.length()})", size="4", color=ColorPalette.GRAY_800),
+            rx.heading(f"Imágenes Subidas ({CalibrationState.num_images})", size="4", color=ColorPalette.GRAY_800),
             
             rx.cond(
                 CalibrationState.images,
                 rx.grid(
                     rx.foreach(
                         CalibrationState.images,
-                        lambda img: rx.box(
-                            rx.image(
-                                # Use annotated image if available, otherwise original
-                                src=rx.cond(
-                                    img["annotated_image_path"],
-                                    "http://localhost:8000/" + img["annotated_image_path"].to(str),
-                                    "http://localhost:8000/" + img["image_path"].to(str)
-                                ),
-                                width="100%", 
-                                height="auto", 
-                                border_radius="md",
-                                alt=img['original_filename']
-                            ),
-                            rx.hstack(
-                                rx.text(img['original_filename'], size="1", color=ColorPalette.GRAY_600),
-                                rx.cond(
-                                    img["charuco_detected"],
-                                    rx.badge("✓ " + img["corners_detected"].to(str) + " corners", color_scheme="green", size="1"),
-                                    rx.badge("✗ No detectado", color_scheme="red", size="1"),
-                                ),
-                                spacing="2",
-                                justify="between",
-                                width="100%",
-                                margin_top="2",
-                            ),
-                            style=CARD_STYLE,
-                        )
+                        lambda img: image_card(img=img)
                     ),
                     columns="4",
                     spacing="4",
@@ -1,8 +1,30 @@
 import reflex as rx
+from typing import Any, Dict
 from .state import CalibrationState
 from ...components.layout import layout
-from ...styles import ColorPalette, BUTTON_STYLE, INPUT_STYLE, CARD_STYLE
+from ...styles import ColorPalette, BUTTON_STYLE, INPUT_STYLE, CARD_STYLE, PRIMARY_BORDER, DASHED_ACCENT_BORDER, BACK_BUTTON_HOVER
 
+
+# Upload event spec, bound once at import instead of rebuilt inside the page function
+_UPLOAD_CSV_EVENT = CalibrationState.upload_csv(rx.upload_files("upload_csv"))
+
+
+@rx.memo
+def pose_row(pose: rx.Var[Dict[str, Any]]) -> rx.Component:
+    """Robot pose table row; re-renders only when its own pose changes."""
+    return rx.table.row(
+        rx.table.cell(pose["pose_index"], color=ColorPalette.GRAY_800),
+        rx.table.cell(pose["x"], color=ColorPalette.GRAY_800),
+        rx.table.cell(pose["y"], color=ColorPalette.GRAY_800),
+        rx.table.cell(pose["z"], color=ColorPalette.GRAY_800),
+        rx.table.cell(pose["rx"], color=ColorPalette.GRAY_800),
+        rx.table.cell(pose["ry"], color=ColorPalette.GRAY_800),
+        rx.table.cell(pose["rz"], color=ColorPalette.GRAY_800),
+    )
+
+
+# Prop-less page: memoized so React reuses the subtree instead of rebuilding it
+@rx.memo
 def poses_page() -> rx.Component:
     return layout(
         rx.vstack(
@@ -12,9 +34,9 @@ def poses_page() -> rx.Component:
                     on_click=rx.redirect(f"/calibration/{CalibrationState.current_calibration_id}/images"),
                     variant="outline",
                     color=ColorPalette.PRIMARY,
-                    border=f"1px solid {ColorPalette.PRIMARY}",
+                    border=PRIMARY_BORDER,
                     size="2",
-                    _hover={"background": ColorPalette.PRIMARY, "color": "white"},
+                    _hover=BACK_BUTTON_HOVER,
                 ),
                 rx.heading("Paso 2: Poses del Robot", size="6", color=ColorPalette.PRIMARY),
                 rx.spacer(),
@@ -37,9 +59,9 @@ def poses_page() -> rx.Component:
                         rx.heading("Importar CSV", size="4"),
                         rx.text("Formato: X, Y, Z, Rx, Ry, Rz o X, Y, Z, A, B, C", size="2", color="gray"),
                         rx.upload(
-                            rx.button("Seleccionar CSV", color=ColorPalette.PRIMARY, bg="white", border=f"1px solid {ColorPalette.PRIMARY}"),
+                            rx.button("Seleccionar CSV", color=ColorPalette.PRIMARY, bg="white", border=PRIMARY_BORDER),
                             id="upload_csv",
-                            border=f"1px dashed {ColorPalette.ACCENT}",
+                            border=DASHED_ACCENT_BORDER,
                             padding="4",
                             border_radius="md",
                             accept={".csv": [".csv"]},
@@ -47,7 +69,7 @@ def poses_page() -> rx.Component:
                         ),
                         rx.button(
                             "Importar",
-                            on_click=CalibrationState.upload_csv(rx.upload_files("upload_csv")),
+                            on_click=_UPLOAD_CSV_EVENT,
                             style=BUTTON_STYLE,
                             width="100%",
                         ),
@@ -74,7 +96,7 @@ def poses_page() -> rx.Component:
             
             rx.divider(),
             
-            rx.heading(f"Poses Cargadas ({CalibrationState.poses.length()})", size="4"),
+            rx.heading(f"Poses Cargadas ({CalibrationState.num_poses})", size="4"),
             
             rx.cond(
                 CalibrationState.poses,
@@ -93,15 +115,7 @@ def poses_page() -> rx.Component:
                     rx.table.body(
                         rx.foreach(
                             CalibrationState.poses,
-                            lambda pose: rx.table.row(
-                                rx.table.cell(pose["pose_index"], color=ColorPalette.GRAY_800),
-                                rx.table.cell(pose["x"], color=ColorPalette.GRAY_800),
-                                rx.table.cell(pose["y"], color=ColorPalette.GRAY_800),
-                                rx.table.cell(pose["z"], color=ColorPalette.GRAY_800),
-                                rx.table.cell(pose["rx"], color=ColorPalette.GRAY_800),
-                                rx.table.cell(pose["ry"], color=ColorPalette.GRAY_800),
-                                rx.table.cell(pose["rz"], color=ColorPalette.GRAY_800),
-                            )
+                            lambda pose: pose_row(pose=pose)
                         )
                     ),
                     width="100%",
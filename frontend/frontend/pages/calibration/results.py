@@ -3,6 +3,131 @@ from .state import CalibrationState
 from ...components.layout import layout
 from ...styles import ColorPalette, BUTTON_STYLE, CARD_STYLE
 
+
+@rx.memo
+def matrix_box() -> rx.Component:
+    """Transformation matrix card, memoized apart from the rest of the page."""
+    return rx.box(
+        rx.vstack(
+            rx.heading("Matriz de Transformación Hand-Eye (4×4)", size="4", margin_bottom="2", color=ColorPalette.GRAY_800),
+            rx.text(
+                CalibrationState.calibration["method"],
+                size="2",
+                color=ColorPalette.GRAY_600,
+                margin_bottom="4",
+            ),
+
+            # Matrix formatted nicely
+            rx.box(
+                CalibrationState.matrix_formatted,
+                style={
+                    "white_space": "pre",
+                    "font_family": "monospace",
+                    "font_size": "15px",
+                    "font_weight": "500",
+                    "background": "#ffffff",
+                    "padding": "24px",
+                    "border_radius": "8px",
+                    "border": f"2px solid {ColorPalette.PRIMARY}",
+                    "line_height": "2.0",
+                    "color": ColorPalette.GRAY_800,
+                },
+            ),
+
+            align_items="start",
+        ),
+        style=CARD_STYLE,
+        width="100%",
+    )
+
+
+@rx.memo
+def metric_card(label: rx.Var[str], value: rx.Var[str], unit: rx.Var[str], color: rx.Var[str]) -> rx.Component:
+    """Card for a single result metric."""
+    return rx.box(
+        rx.vstack(
+            rx.text(label, size="2", weight="bold", color=ColorPalette.GRAY_700),
+            rx.heading(
+                value,
+                size="7",
+                color=color
+            ),
+            rx.text(unit, size="2", color=ColorPalette.GRAY_600),
+            align_items="center",
+            spacing="1",
+        ),
+        style=CARD_STYLE,
+    )
+
+
+# Static (label, unit, accent color) of each metric card; only the values come from state
+METRIC_CARDS = [
+    ("Error de Reproyección", "mm", ColorPalette.PRIMARY, CalibrationState.reprojection_error_formatted),
+    ("Error de Rotación", "grados", ColorPalette.SECONDARY, CalibrationState.rotation_error_formatted),
+    ("Error de Traslación", "mm", ColorPalette.ACCENT, CalibrationState.translation_error_formatted),
+    ("Poses Procesadas", "válidas", ColorPalette.PRIMARY, CalibrationState.poses_summary),
+]
+
+
+@rx.memo
+def metrics_grid() -> rx.Component:
+    """Error metric and pose summary cards, memoized apart from the rest of the page."""
+    return rx.grid(
+        *[
+            metric_card(label=label, value=value, unit=unit, color=color)
+            for label, unit, color, value in METRIC_CARDS
+        ],
+        columns="4",
+        spacing="4",
+        width="100%",
+    )
+
+
+@rx.memo
+def results_success_view() -> rx.Component:
+    """Results for a completed calibration."""
+    return rx.vstack(
+        # Success badge
+        rx.callout(
+            "Calibración completada exitosamente",
+            icon="check",
+            color_scheme="green",
+            variant="soft",
+            size="2",
+            style={"color": "#1b5e20", "background_color": "#e8f5e9", "border": "1px solid #c8e6c9"},
+        ),
+
+        # Transformation Matrix
+        matrix_box(),
+
+        # Metrics Grid
+        metrics_grid(),
+
+        spacing="6",
+        width="100%",
+    )
+
+
+@rx.memo
+def results_pending_view() -> rx.Component:
+    """Notice for a calibration that failed or has not completed yet."""
+    return rx.center(
+        rx.vstack(
+            rx.callout(
+                "Calibración fallida o pendiente",
+                icon="triangle-alert",
+                color_scheme="red",
+                size="2",
+            ),
+            rx.text("Revisa los logs o intenta nuevamente.", color=ColorPalette.GRAY_600),
+            spacing="3",
+        ),
+        padding="10",
+    )
+
+
+# Prop-less page: memoized so React reuses the subtree instead of rebuilding it
+@rx.memo
 def results_page() -> rx.Component:
     return layout(
         rx.vstack(
@@ -20,20 +145,20 @@ def results_page() -> rx.Component:
                     rx.menu.content(
                         rx.menu.item(
                             "Reporte PDF",
-                            on_click=CalibrationState.download_report,
+                            on_click=CalibrationState.download("pdf"),
                         ),
                         rx.menu.separator(),
                         rx.menu.item(
                             "JSON (Completo)",
-                            on_click=CalibrationState.download_json,
+                            on_click=CalibrationState.download("json"),
                         ),
                         rx.menu.item(
                             "CSV (Matriz)",
-                            on_click=CalibrationState.download_csv,
+                            on_click=CalibrationState.download("csv"),
                         ),
                         rx.menu.item(
                             "TXT (Legible)",
-                            on_click=CalibrationState.download_txt,
+                            on_click=CalibrationState.download("txt"),
                         ),
                     ),
                 ),
@@ -46,140 +171,11 @@ def results_page() -> rx.Component:
                 align_items="center",
             ),
             
-            rx.cond(
-                CalibrationState.calibration["status"] == "completed",
-                rx.vstack(
-                    # Success badge
-                    rx.callout(
-                        "Calibración completada exitosamente",
-                        icon="check",
-                        color_scheme="green",
-                        variant="soft",
-                        size="2",
-                        style={"color": "#1b5e20", "background_color": "#e8f5e9", "border": "1px solid #c8e6c9"},
-                    ),
-                    
-                    # Transformation Matrix
-                    rx.box(
-                        rx.vstack(
-                            rx.heading("Matriz de Transformación Hand-Eye (4×4)", size="4", margin_bottom="2", color=ColorPalette.GRAY_800),
-                            rx.text(
-                                CalibrationState.calibration["method"],
-                                size="2",
-                                color=ColorPalette.GRAY_600,
-                                margin_bottom="4",
-                            ),
-                            
-                            # Matrix formatted nicely
-                            rx.box(
-                                CalibrationState.matrix_formatted,
-                                style={
-                                    "white_space": "pre",
-                                    "font_family": "monospace",
-                                    "font_size": "15px",
-                                    "font_weight": "500",
-                                    "background": "#ffffff",
-                                    "padding": "24px",
-                                    "border_radius": "8px",
-                                    "border": f"2px solid {ColorPalette.PRIMARY}",
-                                    "line_height": "2.0",
-                                    "color": ColorPalette.GRAY_800,
-                                },
-                            ),
-                            
-                            align_items="start",
-                        ),
-                        style=CARD_STYLE,
-                        width="100%",
-                    ),
-                    
-                    # Metrics Grid
-                    rx.grid(
-                        # Reprojection Error
-                        rx.box(
-                            rx.vstack(
-                                rx.text("Error de Reproyección", size="2", weight="bold", color=ColorPalette.GRAY_700),
-                                rx.heading(
-                                    CalibrationState.reprojection_error_formatted,
-                                    size="7",
-                                    color=ColorPalette.PRIMARY
-                                ),
-                                rx.text("mm", size="2", color=ColorPalette.GRAY_600),
-                                align_items="center",
-                                spacing="1",
-                            ),
-                            style=CARD_STYLE,
-                        ),
-                        
-                        # Rotation Error
-                        rx.box(
-                            rx.vstack(
-                                rx.text("Error de Rotación", size="2", weight="bold", color=ColorPalette.GRAY_700),
-                                rx.heading(
-                                    CalibrationState.rotation_error_formatted,
-                                    size="7",
-                                    color=ColorPalette.SECONDARY
-                                ),
-                                rx.text("grados", size="2", color=ColorPalette.GRAY_600),
-                                align_items="center",
-                                spacing="1",
-                            ),
-                            style=CARD_STYLE,
-                        ),
-                        
-                        # Translation Error
-                        rx.box(
-                            rx.vstack(
-                                rx.text("Error de Traslación", size="2", weight="bold", color=ColorPalette.GRAY_700),
-                                rx.heading(
-                                    CalibrationState.translation_error_formatted,
-                                    size="7",
-                                    color=ColorPalette.ACCENT
-                                ),
-                                rx.text("mm", size="2", color=ColorPalette.GRAY_600),
-                                align_items="center",
-                                spacing="1",
-                            ),
-                            style=CARD_STYLE,
-                        ),
-                        
-                        # Poses Processed
-                        rx.box(
-                            rx.vstack(
-                                rx.text("Poses Procesadas", size="2", weight="bold", color=ColorPalette.GRAY_700),
-                                rx.heading(
-                                    CalibrationState.poses_summary,
-                                    size="7",
-                                    color=ColorPalette.PRIMARY
-                                ),
-                                rx.text("válidas", size="2", color=ColorPalette.GRAY_600),
-                                align_items="center",
-                                spacing="1",
-                            ),
-                            style=CARD_STYLE,
-                        ),
-                        
-                        columns="4",
-                        spacing="4",
-                        width="100%",
-                    ),
-                    
-                    spacing="6",
-                    width="100%",
-                ),
-                rx.center(
-                    rx.vstack(
-                        rx.callout(
-                            "Calibración fallida o pendiente",
-                            icon="triangle-alert",
-                            color_scheme="red",
-                            size="2",
-                        ),
-                        rx.text("Revisa los logs o intenta nuevamente.", color=ColorPalette.GRAY_600),
-                        spacing="3",
-                    ),
-                    padding="10",
-                ),
+            # Only the branch for the current status is mounted; header and export menu stay put
+            rx.match(
+                CalibrationState.status,
+                ("completed", results_success_view()),
+                results_pending_view(),
             ),
             
             spacing="6",
@@ -1,8 +1,17 @@
+import asyncio
 import reflex as rx
 from typing import List, Dict, Any, Optional
-from ...services.api_client import APIClient
+from ...services.api_client import APIClient, STATIC_BASE_URL
 from ...state import AuthState
 
+# Download format -> (API path, file name template, label for error messages)
+_DOWNLOADS = {
+    "pdf": ("report", "report_calibration_{id}.pdf", "el reporte"),
+    "json": ("export/json", "calibration_{id}.json", "JSON"),
+    "csv": ("export/csv", "calibration_{id}.csv", "CSV"),
+    "txt": ("export/txt", "calibration_{id}.txt", "TXT"),
+}
+
 class CalibrationState(AuthState):
     """State for the calibration wizard."""
     current_calibration_id: int = 0
@@ -167,31 +176,60 @@ class CalibrationState(AuthState):
             print("No calibration_id found in URL or state")
             return
             
-        response = await APIClient.get(f"/calibrations/{self.current_calibration_id}", token=self.token)
+        # Calibration, images and poses are independent: fetch them concurrently
+        response, images, pose_resp = await asyncio.gather(
+            APIClient.get(f"/calibrations/{self.current_calibration_id}", token=self.token),
+            self._fetch_images(),
+            APIClient.get(f"/calibrations/{self.current_calibration_id}/robot-poses", token=self.token),
+        )
+        
         if response.status_code == 200:
             self.calibration = response.json()
         else:
             print(f"Failed to load calibration: {response.status_code} - {response.text}")
     
         # Load images
-        img_resp = await APIClient.get(f"/calibrations/{self.current_calibration_id}/images", token=self.token)
-        if img_resp.status_code == 200:
-            self.images = img_resp.json()
+        if images is not None:
+            self.images = images
         
         # Load poses
-        pose_resp = await APIClient.get(f"/calibrations/{self.current_calibration_id}/robot-poses", token=self.token)
         if pose_resp.status_code == 200:
             self.poses = pose_resp.json()
 
+    async def load_results(self):
+        """Load the results page, reusing a completed calibration already in state (e.g. right after executing it)."""
+        calibration_id_str = self.router.page.params.get("calibration_id", "")
+        if (
+            self.calibration.get("status") == "completed"
+            and str(self.calibration.get("id")) == calibration_id_str
+        ):
+            return await self.check_auth()
+        return await self.load_calibration()
+
+    async def _fetch_images(self) -> Optional[List[Dict[str, Any]]]:
+        """Fetch the calibration's images with their preview URLs resolved, or None on error."""
+        img_resp = await APIClient.get(f"/calibrations/{self.current_calibration_id}/images", token=self.token)
+        if img_resp.status_code != 200:
+            return None
+        
+        images = img_resp.json()
+        # Resolve display values once here: preview URL (thumbnail if available, then annotated
+        # image, then original) and the detection badge label
+        for img in images:
+            img["display_url"] = STATIC_BASE_URL + (
+                img.get("thumbnail_path") or img.get("annotated_image_path") or img["image_path"]
+            )
+            img["corners_label"] = f"✓ {img.get('corners_detected')} corners"
+        return images
+
     async def upload_files(self, files: List[rx.UploadFile]):
         """Upload selected files."""
         if not files:
             return
             
-        upload_data = []
-        for file in files:
-            content = await file.read()
-            upload_data.append(("files", (file.filename, content, file.content_type)))
+        # Reflex already holds each upload in an in-memory buffer; passing those file objects
+        # lets httpx read them in chunks instead of making a second full bytes copy of each
+        upload_data = [("files", (file.filename, file.file, file.content_type)) for file in files]
             
         response = await APIClient.post_files(
             f"/calibrations/{self.current_calibration_id}/upload-images",
@@ -200,7 +238,10 @@ class CalibrationState(AuthState):
         )
         
         if response.status_code == 200:
-            await self.load_calibration()
+            # Only the image list changed: refresh it with a single assignment (one state delta)
+            images = await self._fetch_images()
+            if images is not None:
+                self.images = images
             return rx.window_alert("Imágenes subidas correctamente")
         else:
             return rx.window_alert("Error al subir imágenes")
@@ -211,11 +252,10 @@ class CalibrationState(AuthState):
             return
             
         file = files[0]
-        content = await file.read()
         
         response = await APIClient.post_files(
             f"/calibrations/{self.current_calibration_id}/import-robot-poses-csv",
-            files={"file": (file.filename, content, file.content_type)},
+            files={"file": (file.filename, file.file, file.content_type)},
             token=self.token
         )
         
@@ -232,10 +272,8 @@ class CalibrationState(AuthState):
         if response.status_code == 200:
             result = response.json()
             if result["success"]:
-                # Update calibration with results
-                self.calibration.update(result)
-                self.calibration["status"] = "completed"
-                await self.load_calibration()
+                # The response carries the updated run: show it without re-fetching
+                self.calibration = result["calibration"]
                 return rx.redirect(f"/calibration/{self.current_calibration_id}/results")
             else:
                 return rx.window_alert(f"Error: {result.get('error_message')}")
@@ -243,7 +281,26 @@ class CalibrationState(AuthState):
             return rx.window_alert("Error de servidor al ejecutar calibración")
 
     @rx.var
-    def matrix_formatted(self) -> str:
+    def num_images(self) -> int:
+        """Number of uploaded images."""
+        return len(self.images)
+    
+    @rx.var
+    def num_poses(self) -> int:
+        """Number of loaded robot poses."""
+        return len(self.poses)
+    
+    @rx.var(cache=True)
+    def status(self) -> str:
+        """Calibration status, defaulting to pending until the run is loaded."""
+        return self.calibration.get("status", "pending")
+    
+    @rx.var
+    def is_data_synced(self) -> bool:
+        """Whether there are images and exactly one robot pose per image."""
+        return len(self.images) > 0 and len(self.images) == len(self.poses)
+    
+    def _format_matrix(self) -> str:
         """Format transformation matrix as readable text."""
         if not self.calibration or "transformation_matrix" not in self.calibration:
             return "No hay matriz disponible"
@@ -258,41 +315,17 @@ class CalibrationState(AuthState):
         except (TypeError, ValueError, KeyError):
             return str(matrix)
     
-    @rx.var
-    def rotation_error_formatted(self) -> str:
-        """Format rotation error."""
-        if not self.calibration:
-            return "0.00"
+    def _format_metric(self, key: str) -> str:
+        """Format a calibration metric with 2 decimals, or a dash while it is not available."""
+        val = self.calibration.get(key)
+        if val is None:
+            return "—"
         try:
-            val = self.calibration.get("rotation_error_deg", 0)
             return f"{float(val):.2f}"
         except (TypeError, ValueError):
-            return "0.00"
+            return "—"
     
-    @rx.var
-    def translation_error_formatted(self) -> str:
-        """Format translation error."""
-        if not self.calibration:
-            return "0.00"
-        try:
-            val = self.calibration.get("translation_error_mm", 0)
-            return f"{float(val):.2f}"
-        except (TypeError, ValueError):
-            return "0.00"
-    
-    @rx.var
-    def reprojection_error_formatted(self) -> str:
-        """Format reprojection error."""
-        if not self.calibration:
-            return "0.00"
-        try:
-            val = self.calibration.get("reprojection_error", 0)
-            return f"{float(val):.2f}"
-        except (TypeError, ValueError):
-            return "0.00"
-    
-    @rx.var
-    def poses_summary(self) -> str:
+    def _format_poses_summary(self) -> str:
         """Format poses processed summary."""
         if not self.calibration:
             return "0/0"
@@ -303,62 +336,54 @@ class CalibrationState(AuthState):
         except (TypeError, ValueError):
             return "0/0"
     
-    async def download_report(self):
-        """Download the calibration report."""
-        if not self.current_calibration_id:
-            return
-            
-        try:
-            content = await APIClient.download(f"/calibrations/{self.current_calibration_id}/report", token=self.token)
-            return rx.download(
-                data=content,
-                filename=f"report_calibration_{self.current_calibration_id}.pdf",
-            )
-        except Exception as e:
-            print(f"Download error: {e}")
-            return rx.window_alert("Error al descargar el reporte.")
+    @rx.var
+    def _formatted_bundle(self) -> Dict[str, str]:
+        """All result display strings, formatted together once per calibration update (backend-only)."""
+        return {
+            "matrix": self._format_matrix(),
+            "rot": self._format_metric("rotation_error_deg"),
+            "trans": self._format_metric("translation_error_mm"),
+            "reproj": self._format_metric("reprojection_error"),
+            "poses": self._format_poses_summary(),
+        }
     
-    async def download_json(self):
-        """Download calibration results as JSON."""
-        if not self.current_calibration_id:
-            return
-            
-        try:
-            content = await APIClient.download(f"/calibrations/{self.current_calibration_id}/export/json", token=self.token)
-            return rx.download(
-                data=content,
-                filename=f"calibration_{self.current_calibration_id}.json",
-            )
-        except Exception as e:
-            print(f"Download error: {e}")
-            return rx.window_alert("Error al descargar JSON.")
+    @rx.var
+    def matrix_formatted(self) -> str:
+        """Format transformation matrix as readable text."""
+        return self._formatted_bundle["matrix"]
     
-    async def download_csv(self):
-        """Download calibration matrix as CSV."""
-        if not self.current_calibration_id:
-            return
-            
-        try:
-            content = await APIClient.download(f"/calibrations/{self.current_calibration_id}/export/csv", token=self.token)
-            return rx.download(
-                data=content,
-                filename=f"calibration_{self.current_calibration_id}.csv",
-            )
-        except Exception as e:
-            print(f"Download error: {e}")
-            return rx.window_alert("Error al descargar CSV.")
+    @rx.var
+    def rotation_error_formatted(self) -> str:
+        """Format rotation error."""
+        return self._formatted_bundle["rot"]
+    
+    @rx.var
+    def translation_error_formatted(self) -> str:
+        """Format translation error."""
+        return self._formatted_bundle["trans"]
+    
+    @rx.var
+    def reprojection_error_formatted(self) -> str:
+        """Format reprojection error."""
+        return self._formatted_bundle["reproj"]
     
-    async def download_txt(self):
-        """Download calibration summary as TXT."""
+    @rx.var
+    def poses_summary(self) -> str:
+        """Format poses processed summary."""
+        return self._formatted_bundle["poses"]
+    
+    async def download(self, fmt: str):
+        """Download the calibration report or one of its exports."""
         if not self.current_calibration_id:
             return
-            
+        
+        path, filename, label = _DOWNLOADS[fmt]
         try:
-            content = await APIClient.download(f"/calibrations/{self.current_calibration_id}/export/txt", token=self.token)
+            content = await APIClient.download(f"/calibrations/{self.current_calibration_id}/{path}", token=self.token)
             return rx.download(
                 data=content,
-                filename=f"calibration_{self.current_calibration_id}.txt",
+                filename=filename.format(id=self.current_calibration_id),
             )
         except Exception as e:
             print(f"Download error: {e}")
-            return rx.window_alert("Error al descargar TXT.")
+            return rx.window_alert(f"Error al descargar {label}.")
@@ -109,6 +109,37 @@ def calibration_card(cal: dict) -> rx.Component:
         width="100%",
     )
 
+@rx.memo
+def calibrations_grid() -> rx.Component:
+    """Calibration cards grid, or the empty-list notice."""
+    return rx.cond(
+        DashboardState.calibrations,
+        rx.grid(
+            rx.foreach(
+                DashboardState.calibrations,
+                calibration_card
+            ),
+            columns="3",
+            spacing="4",
+            width="100%",
+        ),
+        rx.center(
+            rx.vstack(
+                rx.text("No hay calibraciones aún.", color="gray"),
+                rx.cond(
+                    DashboardState.can_create_calibration,
+                    rx.button(
+                        "Crear la primera",
+                        variant="ghost",
+                        on_click=DashboardState.create_calibration,
+                    ),
+                ),
+            ),
+            padding="10",
+            width="100%",
+        ),
+    )
+
 def dashboard_page() -> rx.Component:
     return layout(
         rx.vstack(
@@ -128,33 +159,7 @@ def dashboard_page() -> rx.Component:
                 align_items="center",
             ),
             
-            rx.cond(
-                DashboardState.calibrations,
-                rx.grid(
-                    rx.foreach(
-                        DashboardState.calibrations,
-                        calibration_card
-                    ),
-                    columns="3",
-                    spacing="4",
-                    width="100%",
-                ),
-                rx.center(
-                    rx.vstack(
-                        rx.text("No hay calibraciones aún.", color="gray"),
-                        rx.cond(
-                            DashboardState.can_create_calibration,
-                            rx.button(
-                                "Crear la primera",
-                                variant="ghost",
-                                on_click=DashboardState.create_calibration,
-                            ),
-                        ),
-                    ),
-                    padding="10",
-                    width="100%",
-                ),
-            ),
+            calibrations_grid(),
             
             # Confirmation Dialog
             rx.alert_dialog.root(
@@ -3,6 +3,8 @@ import reflex as rx
 from typing import Optional, Dict, Any
 
 API_URL = "http://localhost:8001/api/v1"
+# Base URL uploaded calibration images are served from
+STATIC_BASE_URL = "http://localhost:8000/"
 
 class APIClient:
     """Client for making requests to the backend API."""
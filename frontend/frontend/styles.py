@@ -16,6 +16,12 @@ class ColorPalette:
     ERROR = "#f56565"        # Rojo para error
 
 
+# Shared border and hover values, built once instead of inside every page
+PRIMARY_BORDER = f"1px solid {ColorPalette.PRIMARY}"
+ACCENT_BORDER = f"1px solid {ColorPalette.ACCENT}"
+DASHED_ACCENT_BORDER = f"1px dashed {ColorPalette.ACCENT}"
+BACK_BUTTON_HOVER = {"background": ColorPalette.PRIMARY, "color": "white"}
+
 STYLES = {
     "font_family": "Inter, system-ui, sans-serif",
     "background_color": ColorPalette.BACKGROUND,
@@ -34,7 +40,7 @@ BUTTON_STYLE = {
 }
 
 INPUT_STYLE = {
-    "border": f"1px solid {ColorPalette.ACCENT}",
+    "border": ACCENT_BORDER,
     "border_radius": "6px",
     "padding": "8px 12px",
     "color": ColorPalette.GRAY_800,
@@ -51,7 +57,7 @@ INPUT_STYLE = {
 
 CARD_STYLE = {
     "background": "white",
-    "border": f"1px solid {ColorPalette.ACCENT}",
+    "border": ACCENT_BORDER,
     "border_radius": "12px",
     "padding": "20px",
     "box_shadow": "0 2px 8px rgba(162, 117, 194, 0.1)",
@@ -3,9 +3,15 @@ Diagnostic script to inspect calibration data and check for unit/format issues.
 """
 import sqlite3
 import os
-import json
+import sys
+from pathlib import Path
 import numpy as np
 
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.calibration.error_metrics import translation_residual
+
 # Get the database path
 backend_dir = os.path.join(os.path.dirname(__file__), "..", "backend")
 db_path = os.path.join(backend_dir, "handeye_calibration.db")
@@ -15,7 +21,17 @@ if not os.path.exists(db_path):
 
 print(f"📊 Connecting to database: {db_path}")
 
-conn = sqlite3.connect(db_path)
+# Read-side tuning: larger page cache, memory-mapped I/O, in-memory temp tables
+READ_PRAGMAS = ("cache_size=-20000", "temp_store=memory", "mmap_size=268435456", "busy_timeout=5000")
+
+def open_db(path):
+    """Open the SQLite database read-only (never takes write locks) with tuned PRAGMAs."""
+    conn = sqlite3.connect(f"file:{Path(path).resolve().as_posix()}?mode=ro", uri=True)
+    for pragma in READ_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    return conn
+
+conn = open_db(db_path)
 conn.row_factory = sqlite3.Row
 cursor = conn.cursor()
 
@@ -34,21 +50,22 @@ print(f"Reprojection Error: {calib['reprojection_error']}")
 print(f"Translation Error: {calib['translation_error_mm']}")
 print(f"Rotation Error: {calib['rotation_error_deg']}")
 
-# Get Robot Poses
-cursor.execute("SELECT * FROM robot_poses WHERE calibration_run_id = ? ORDER BY pose_index", (calib['id'],))
-robot_poses = cursor.fetchall()
+# Get Robot Poses with their computed Camera Poses, aligned by pose_index in one query
+cursor.execute("""
+    SELECT rp.pose_index, rp.pose, cp.rotation_matrix, cp.translation_vector
+    FROM robot_poses rp
+    LEFT JOIN camera_poses cp
+        ON cp.calibration_run_id = rp.calibration_run_id AND cp.pose_index = rp.pose_index
+    WHERE rp.calibration_run_id = ?
+    ORDER BY rp.pose_index
+""", (calib['id'],))
+rows = cursor.fetchall()
 
-print(f"\n🤖 Robot Poses ({len(robot_poses)}):")
-xs, ys, zs = [], [], []
-rxs, rys, rzs = [], [], []
+# Each row stores x, y, z, rx, ry, rz as six packed float64s: decode all rows at once
+pose_values = np.frombuffer(b''.join(row['pose'] for row in rows), dtype=np.float64).reshape(-1, 6)
 
-for pose in robot_poses:
-    xs.append(pose['x'])
-    ys.append(pose['y'])
-    zs.append(pose['z'])
-    rxs.append(pose['rx'])
-    rys.append(pose['ry'])
-    rzs.append(pose['rz'])
+print(f"\n🤖 Robot Poses ({len(pose_values)}):")
+xs, ys, zs, rxs, rys, rzs = pose_values.T
 
 print(f"  X range: {min(xs):.4f} to {max(xs):.4f}")
 print(f"  Y range: {min(ys):.4f} to {max(ys):.4f}")
@@ -73,14 +90,14 @@ if max_rot < 7.0: # 2*pi is ~6.28
 else:
     print("\n✅ Robot rotation values look like DEGREES (> 7.0).")
 
-# Get Camera Poses (computed)
-cursor.execute("SELECT * FROM camera_poses WHERE calibration_run_id = ? ORDER BY pose_index", (calib['id'],))
-camera_poses = cursor.fetchall()
+# Camera Poses (computed) joined to the robot poses above
+has_camera_pose = np.array([row['rotation_matrix'] is not None for row in rows], dtype=bool)
+camera_poses = [row for row in rows if row['rotation_matrix'] is not None]
 
 print(f"\n📷 Camera Poses ({len(camera_poses)}):")
 if len(camera_poses) > 0:
-    # Parse JSON translation vector
-    t_cam = json.loads(camera_poses[0]['translation_vector'])
+    # Translation vector is stored as raw float64 bytes
+    t_cam = np.frombuffer(camera_poses[0]['translation_vector'], dtype=np.float64)
     print(f"  Sample T (Pose 1): {t_cam}")
     
     # Check camera units
@@ -92,58 +109,52 @@ if len(camera_poses) > 0:
     else:
         print("  ✅ Camera translation seems to be in MM.")
 
+# All rows are loaded: release the database before the calibration sweep
+conn.close()
+
 # ============================================================================
 # Test Calibration with Different Rotation Formats
 # ============================================================================
-print("\n🧪 Testing Rotation Formats...")
-
 import cv2
+from concurrent.futures import ThreadPoolExecutor
 from scipy.spatial.transform import Rotation as R
 
-def get_matrix(pose, fmt):
-    x, y, z = pose['x'], pose['y'], pose['z']
-    rx, ry, rz = pose['rx'], pose['ry'], pose['rz']
-    
-    t = np.array([x, y, z])
+def to_homogeneous(rotations, translations):
+    """Stack (N,3,3) rotations and (N,3) translations into (N,4,4) transforms."""
+    mats = np.zeros((len(rotations), 4, 4))
+    mats[:, :3, :3] = rotations
+    mats[:, :3, 3] = translations
+    mats[:, 3, 3] = 1.0
+    return mats
+
+def get_matrices(poses, fmt):
+    """All robot poses as (N,4,4) transforms, with one SciPy call per format."""
+    translations = poses[:, :3]
+    angles = np.array(poses[:, 3:6])  # writable copy: SciPy rejects read-only buffers
     
     if fmt == 'euler_xyz':
-        r = R.from_euler('xyz', [rx, ry, rz], degrees=True)
+        r = R.from_euler('xyz', angles, degrees=True)
     elif fmt == 'euler_zyx':
         # KUKA A,B,C is Z,Y,X. 
         # If mapped A->rx, B->ry, C->rz, then rx=Z, ry=Y, rz=X
         # So we want rotation order z,y,x with angles rx,ry,rz
-        r = R.from_euler('zyx', [rx, ry, rz], degrees=True)
+        r = R.from_euler('zyx', angles, degrees=True)
     elif fmt == 'rot_vec':
-        # Rotation vector (magnitude is angle in radians usually, but here maybe degrees?)
-        # If degrees=True in user input, we might need to convert magnitude to radians
-        vec = np.array([rx, ry, rz])
-        mag = np.linalg.norm(vec)
-        if mag > 0:
-            # Assume vector is in degrees (magnitude is degrees)
-            # Convert to radians for scipy
-            vec_rad = vec * (np.pi / 180.0)
-            r = R.from_rotvec(vec_rad)
-        else:
-            r = R.identity()
+        # Rotation vector with magnitude in degrees: convert to radians for scipy
+        # (a zero vector is the identity rotation)
+        r = R.from_rotvec(angles * (np.pi / 180.0))
     elif fmt == 'rot_vec_rad':
         # Assume already radians
-        r = R.from_rotvec(np.array([rx, ry, rz]))
-        
-    mat = np.eye(4)
-    mat[:3, :3] = r.as_matrix()
-    mat[:3, 3] = t
-    return mat
+        r = R.from_rotvec(angles)
+    
+    return to_homogeneous(r.as_matrix(), translations)
 
 def solve_calib(robot_matrices, camera_matrices):
-    R_gripper2base = [m[:3, :3] for m in robot_matrices]
-    t_gripper2base = [m[:3, 3] for m in robot_matrices]
-    R_target2cam = [m[:3, :3] for m in camera_matrices]
-    t_target2cam = [m[:3, 3] for m in camera_matrices]
-    
+    # cv2 takes per-pose lists: split the stacked arrays only at the call boundary
     try:
         R_cam2gripper, t_cam2gripper = cv2.calibrateHandEye(
-            R_gripper2base, t_gripper2base,
-            R_target2cam, t_target2cam,
+            list(robot_matrices[:, :3, :3]), list(robot_matrices[:, :3, 3]),
+            list(camera_matrices[:, :3, :3]), list(camera_matrices[:, :3, 3]),
             method=cv2.CALIB_HAND_EYE_TSAI
         )
         
@@ -151,93 +162,103 @@ def solve_calib(robot_matrices, camera_matrices):
         X[:3, :3] = R_cam2gripper
         X[:3, 3] = t_cam2gripper.ravel()
         
-        # Calculate error (consistency)
-        errors = []
-        for A, B in zip(robot_matrices, camera_matrices):
-            # T_target_base = A * X * B
-            T = A @ X @ B
-            errors.append(T[:3, 3])
-        
-        mean_t = np.mean(errors, axis=0)
-        trans_errors = [np.linalg.norm(t - mean_t) for t in errors]
-        return np.mean(trans_errors)
+        # Calculate error (consistency): T_target_base = A * X * B for every pose
+        return translation_residual(X, robot_matrices, camera_matrices)
         
     except Exception as e:
         return float('inf')
 
-# Prepare camera matrices
-cam_mats = []
-for cp in camera_poses:
-    rm = np.array(json.loads(cp['rotation_matrix']))
-    tv = np.array(json.loads(cp['translation_vector']))
-    m = np.eye(4)
-    m[:3, :3] = rm
-    m[:3, 3] = tv
-    cam_mats.append(m)
+# Prepare camera matrices (rotation and translation are stored as raw float64 bytes)
+cam_mats = to_homogeneous(
+    np.frombuffer(b''.join(cp['rotation_matrix'] for cp in camera_poses), dtype=np.float64).reshape(-1, 3, 3),
+    np.frombuffer(b''.join(cp['translation_vector'] for cp in camera_poses), dtype=np.float64).reshape(-1, 3)
+)
 
-formats = ['euler_xyz', 'euler_zyx', 'rot_vec', 'rot_vec_rad']
+def invert_matrices(Ms):
+    """Invert a stack of rigid transforms: [R | t]^-1 = [R^T | -R^T t]."""
+    Rt = Ms[:, :3, :3].transpose(0, 2, 1)
+    return to_homogeneous(Rt, -np.einsum('nij,nj->ni', Rt, Ms[:, :3, 3]))
 
-for fmt in formats:
-    rob_mats = [get_matrix(p, fmt) for p in robot_poses]
-    if len(rob_mats) == len(cam_mats) and len(rob_mats) > 2:
-        error = solve_calib(rob_mats, cam_mats)
-        print(f"  Format {fmt:15s}: Error = {error:.2f} mm")
-    else:
-        print(f"  Format {fmt:15s}: Not enough data")
+# Largest |R R^T - I| entry accepted as a rotation (stored matrices carry float64 round-off only)
+ORTHO_TOL = 1e-6
 
+def is_orthonormal(matrices):
+    """Whether every 3x3 rotation block in a (N,4,4) stack is orthonormal."""
+    Rs = matrices[:, :3, :3]
+    return np.abs(np.einsum('nij,nkj->nik', Rs, Rs) - np.eye(3)).max() <= ORTHO_TOL
 
-print("\n🧪 Testing Configurations (Inversions)...")
+def eval_config(config):
+    """Calibration error for one (robot, camera) configuration, or None without enough pose pairs."""
+    robs, cams = config
+    if len(robs) == len(cams) and len(robs) > 2:
+        # Non-rotation input can only fail: skip the expensive calibrateHandEye call
+        if not (is_orthonormal(robs) and is_orthonormal(cams)):
+            return float('inf')
+        return solve_calib(robs, cams)
+    return None
+
+# Only robot poses with a camera pose at the same pose_index form calibration pairs
+paired_pose_values = pose_values[has_camera_pose]
 
-def invert_matrix(M):
-    R = M[:3, :3]
-    t = M[:3, 3]
-    Minv = np.eye(4)
-    Minv[:3, :3] = R.T
-    Minv[:3, 3] = -R.T @ t
-    return Minv
+formats = ['euler_xyz', 'euler_zyx', 'rot_vec', 'rot_vec_rad']
+# The only SciPy rotation builds of the sweep: every configuration below reuses these stacks
+format_rob_mats = {fmt: get_matrices(paired_pose_values, fmt) for fmt in formats}
 
 # Base matrices (using Euler XYZ as it was close-ish)
-base_rob_mats = [get_matrix(p, 'euler_xyz') for p in robot_poses]
+base_rob_mats = format_rob_mats['euler_xyz']
 base_cam_mats = cam_mats
+inv_rob_mats = invert_matrices(base_rob_mats)
+inv_cam_mats = invert_matrices(base_cam_mats)
+kuka_rob_mats = format_rob_mats['euler_zyx']
+inv_kuka_rob_mats = invert_matrices(kuka_rob_mats)
 
 configs = [
     ("Standard (Eye-in-Hand)", base_rob_mats, base_cam_mats),
-    ("Inverted Robot (Eye-to-Hand?)", [invert_matrix(m) for m in base_rob_mats], base_cam_mats),
-    ("Inverted Camera", base_rob_mats, [invert_matrix(m) for m in base_cam_mats]),
-    ("Both Inverted", [invert_matrix(m) for m in base_rob_mats], [invert_matrix(m) for m in base_cam_mats]),
+    ("Inverted Robot (Eye-to-Hand?)", inv_rob_mats, base_cam_mats),
+    ("Inverted Camera", base_rob_mats, inv_cam_mats),
+    ("Both Inverted", inv_rob_mats, inv_cam_mats),
 ]
 
-for name, robs, cams in configs:
-    if len(robs) == len(cams) and len(robs) > 2:
-        error = solve_calib(robs, cams)
-        print(f"  Config {name:30s}: Error = {error:.2f} mm")
-
-print("\n🧪 Testing KUKA Format (Euler ZYX) with Inversions...")
-kuka_rob_mats = [get_matrix(p, 'euler_zyx') for p in robot_poses]
-
 configs_kuka = [
     ("KUKA Standard", kuka_rob_mats, base_cam_mats),
-    ("KUKA Inv Robot", [invert_matrix(m) for m in kuka_rob_mats], base_cam_mats),
-    ("KUKA Inv Cam", kuka_rob_mats, [invert_matrix(m) for m in base_cam_mats]),
+    ("KUKA Inv Robot", inv_kuka_rob_mats, base_cam_mats),
+    ("KUKA Inv Cam", kuka_rob_mats, inv_cam_mats),
 ]
 
-for name, robs, cams in configs_kuka:
-    if len(robs) == len(cams) and len(robs) > 2:
-        error = solve_calib(robs, cams)
+# Every configuration is independent: evaluate the whole sweep concurrently
+# (cv2.calibrateHandEye and the batched NumPy work release the GIL), then report in order
+sweep = [(format_rob_mats[fmt], cam_mats) for fmt in formats]
+sweep += [(robs, cams) for _, robs, cams in configs + configs_kuka]
+with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+    errors = list(pool.map(eval_config, sweep))
+format_errors = errors[:len(formats)]
+config_errors = errors[len(formats):len(formats) + len(configs)]
+kuka_errors = errors[len(formats) + len(configs):]
+
+print("\n🧪 Testing Rotation Formats...")
+for fmt, error in zip(formats, format_errors):
+    if error is not None:
+        print(f"  Format {fmt:15s}: Error = {error:.2f} mm")
+    else:
+        print(f"  Format {fmt:15s}: Not enough data")
+
+
+print("\n🧪 Testing Configurations (Inversions)...")
+for (name, _, _), error in zip(configs, config_errors):
+    if error is not None:
+        print(f"  Config {name:30s}: Error = {error:.2f} mm")
+
+print("\n🧪 Testing KUKA Format (Euler ZYX) with Inversions...")
+for (name, _, _), error in zip(configs_kuka, kuka_errors):
+    if error is not None:
         print(f"  Config {name:30s}: Error = {error:.2f} mm")
 
 print("\n📏 Checking Scale Factor (Relative Motion)...")
 
 def get_relative_translations(matrices):
-    trans_mags = []
-    for i in range(len(matrices) - 1):
-        # Rel transform T_i^{-1} * T_{i+1}
-        T1 = matrices[i]
-        T2 = matrices[i+1]
-        T_rel = np.linalg.inv(T1) @ T2
-        mag = np.linalg.norm(T_rel[:3, 3])
-        trans_mags.append(mag)
-    return np.array(trans_mags)
+    # Rel transform T_i^{-1} * T_{i+1} has translation R_i^T (t_{i+1} - t_i), and R_i^T preserves
+    # its length: the magnitudes come straight from the translations, without (N,4,4) temporaries
+    return np.linalg.norm(np.diff(matrices[:, :3, 3], axis=0), axis=1)
 
 rob_mags = get_relative_translations(base_rob_mats)
 cam_mags = get_relative_translations(base_cam_mats)
@@ -265,11 +286,8 @@ if len(rob_mags) > 0 and len(cam_mags) > 0:
     # Try to solve with scaled camera poses
     print(f"\n🧪 Testing with Scale Factor {median_ratio:.4f}...")
     
-    scaled_cam_mats = []
-    for m in base_cam_mats:
-        m_scaled = m.copy()
-        m_scaled[:3, 3] *= median_ratio
-        scaled_cam_mats.append(m_scaled)
+    scaled_cam_mats = base_cam_mats.copy()
+    scaled_cam_mats[:, :3, 3] *= median_ratio
     
     error_scaled = solve_calib(base_rob_mats, scaled_cam_mats)
     print(f"  Scaled Standard: Error = {error_scaled:.2f} mm")
@@ -277,5 +295,3 @@ if len(rob_mags) > 0 and len(cam_mags) > 0:
     # Try scaled with KUKA
     error_scaled_kuka = solve_calib(kuka_rob_mats, scaled_cam_mats)
     print(f"  Scaled KUKA: Error = {error_scaled_kuka:.2f} mm")
-
-conn.close()
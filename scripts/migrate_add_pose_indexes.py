@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+import sqlite3
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import settings
+
+# Tables keyed by (calibration_run_id, pose_index)
+POSE_TABLES = ["robot_poses", "camera_poses", "calibration_images"]
+
+
+def migrate():
+    """
+    Add unique (calibration_run_id, pose_index) indexes to the pose tables,
+    replacing the single-column calibration_run_id indexes they make redundant.
+    """
+    db_path = Path(settings.DATABASE_URL.replace("sqlite:///", ""))
+    print(f"Migrating database at: {db_path}")
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        for table in POSE_TABLES:
+            duplicates = cursor.execute(
+                f"SELECT calibration_run_id, pose_index, COUNT(*) FROM {table} "
+                f"GROUP BY calibration_run_id, pose_index HAVING COUNT(*) > 1"
+            ).fetchall()
+            if duplicates:
+                raise ValueError(f"{table} has duplicate (calibration_run_id, pose_index) rows: {duplicates}")
+            
+            cursor.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{table}_run_pose_index "
+                f"ON {table} (calibration_run_id, pose_index)"
+            )
+            cursor.execute(f"DROP INDEX IF EXISTS ix_{table}_calibration_run_id")
+            print(f"Added ix_{table}_run_pose_index")
+        
+        conn.commit()
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Error migrating database: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import settings
+from backend.models import User, CalibrationRun, RobotPose
+from backend.models.types import IntEnumType
+from migration_utils import connect, enum_code_expr, rebuild_table, text_enum_columns, transaction
+
+MODELS = [User, CalibrationRun, RobotPose]
+
+
+def convert_table(cursor, table):
+    """
+    Store the enum columns of `table` as SMALLINT codes.
+    
+    Tables still declaring the old enum columns are rebuilt from the model. Tables
+    that already declare SMALLINT (e.g. rebuilt by another migration) only get
+    their remaining text rows converted, decided per row rather than by declared type.
+    """
+    enum_columns = [c for c in table.columns if isinstance(c.type, IntEnumType)]
+    declared = {row[1]: row[2] for row in cursor.execute(f"PRAGMA table_info({table.name})")}
+    
+    if any(declared.get(c.name, "").upper() != "SMALLINT" for c in enum_columns):
+        rebuild_table(cursor, table)
+        print(f"Rebuilt {table.name} with SMALLINT enum columns: {', '.join(c.name for c in enum_columns)}")
+        return
+    
+    text_columns = text_enum_columns(cursor, table)
+    if not text_columns:
+        print(f"{table.name} already stores SMALLINT enum codes")
+        return
+    
+    for column in text_columns:
+        cursor.execute(
+            f"UPDATE {table.name} SET {column.name} = {enum_code_expr(column.name, column.type)} "
+            f"WHERE typeof({column.name}) = 'text'"
+        )
+        print(f"Converted {cursor.rowcount} {table.name}.{column.name} values")
+
+
+def migrate():
+    """
+    Store role / status / input_method enums as SMALLINT codes instead of names.
+    Each table is converted in its own transaction.
+    """
+    db_path = Path(settings.DATABASE_URL.replace("sqlite:///", ""))
+    print(f"Migrating database at: {db_path}")
+    
+    conn = connect(db_path)
+    
+    try:
+        for model in MODELS:
+            with transaction(conn) as cursor:
+                convert_table(cursor, model.__table__)
+        
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+        print(f"Foreign key violations: {len(violations)}")
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Error migrating database: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
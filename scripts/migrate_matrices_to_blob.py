@@ -0,0 +1,49 @@
+"""
+Database migration: Convert JSON matrix columns to raw float64 BLOBs.
+Rewrites rotation_matrix / translation_vector (robot_poses, camera_poses) and
+transformation_matrix (calibration_runs) from JSON text to packed float64 bytes.
+"""
+import sqlite3
+import orjson
+import numpy as np
+from pathlib import Path
+
+# Database path
+db_path = Path(__file__).parent.parent / "handeye_calibration.db"
+
+# (table, column) pairs stored as float64 BLOBs by the models
+MATRIX_COLUMNS = [
+    ("robot_poses", "rotation_matrix"),
+    ("robot_poses", "translation_vector"),
+    ("camera_poses", "rotation_matrix"),
+    ("camera_poses", "translation_vector"),
+    ("calibration_runs", "transformation_matrix"),
+]
+
+print(f"Connecting to database: {db_path}")
+
+conn = sqlite3.connect(str(db_path))
+cursor = conn.cursor()
+
+try:
+    for table, column in MATRIX_COLUMNS:
+        # Only rows still holding JSON text need conversion (already-migrated rows are BLOBs)
+        cursor.execute(f"SELECT id, {column} FROM {table} WHERE typeof({column}) = 'text'")
+        rows = cursor.fetchall()
+        
+        updates = [
+            (np.asarray(orjson.loads(value), dtype=np.float64).tobytes(), row_id)
+            for row_id, value in rows
+        ]
+        cursor.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", updates)
+        print(f"✓ {table}.{column}: converted {len(updates)} rows")
+    
+    conn.commit()
+    print("✓ Migration completed successfully")
+    
+except (sqlite3.OperationalError, ValueError) as e:
+    print(f"✗ Error: {e}")
+    conn.rollback()
+finally:
+    conn.close()
+    print("Database connection closed")
@@ -0,0 +1,75 @@
+import sys
+from pathlib import Path
+import base64
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import settings
+from backend.models import User
+from backend.utils.encryption import EncryptionService
+from migration_utils import connect, rebuild_table, transaction
+
+ENCRYPTED_COLUMNS = ("mfa_secret", "mfa_code")
+
+
+def rebuild_users_table(cursor, table):
+    """
+    Rebuild the users table from its model definition so the encrypted MFA
+    columns are declared as BLOB.
+    """
+    declared = {row[1]: row[2] for row in cursor.execute(f"PRAGMA table_info({table.name})")}
+    if all(declared.get(name, "").upper() == "BLOB" for name in ENCRYPTED_COLUMNS):
+        print(f"{table.name} already stores MFA values as BLOB")
+        return False
+    
+    rebuild_table(cursor, table)
+    print(f"Rebuilt {table.name} with BLOB columns: {', '.join(ENCRYPTED_COLUMNS)}")
+    return True
+
+
+def convert_values(cursor):
+    """Replace base64 text ciphertext with the raw nonce + ciphertext bytes."""
+    for column in ENCRYPTED_COLUMNS:
+        rows = cursor.execute(
+            f"SELECT id, {column} FROM users WHERE typeof({column}) = 'text'"
+        ).fetchall()
+        
+        updates = []
+        for user_id, value in rows:
+            if EncryptionService.decrypt(value) is None:
+                # Unencrypted or unreadable values (e.g. plaintext setup codes) cannot be kept as BLOB
+                print(f"User {user_id}: {column} is not valid ciphertext, cleared")
+                updates.append((None, user_id))
+            else:
+                updates.append((base64.b64decode(value), user_id))
+        
+        cursor.executemany(f"UPDATE users SET {column} = ? WHERE id = ?", updates)
+        print(f"Converted {len(updates)} {column} values")
+
+
+def migrate():
+    """
+    Store encrypted MFA values as raw BLOBs instead of base64 text.
+    """
+    db_path = Path(settings.DATABASE_URL.replace("sqlite:///", ""))
+    print(f"Migrating database at: {db_path}")
+    
+    conn = connect(db_path)
+    
+    try:
+        with transaction(conn) as cursor:
+            rebuild_users_table(cursor, User.__table__)
+            convert_values(cursor)
+        
+        violations = conn.execute("PRAGMA foreign_key_check").fetchall()
+        print(f"Foreign key violations: {len(violations)}")
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Error migrating database: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import settings
+from backend.models import CalibrationRun
+from migration_utils import connect, rebuild_table, transaction
+
+# Packing order of the camera_intrinsics BLOB
+INTRINSIC_FIELDS = (
+    "camera_fx", "camera_fy", "camera_cx", "camera_cy",
+    "camera_k1", "camera_k2", "camera_p1", "camera_p2", "camera_k3",
+)
+
+
+def pack_intrinsics(values):
+    """Nine nullable floats -> 72-byte float64 BLOB (NaN for missing), or None if all missing."""
+    if all(v is None for v in values):
+        return None
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64).tobytes()
+
+
+def migrate():
+    """
+    Replace the nine camera_* intrinsic columns of calibration_runs with the packed
+    camera_intrinsics BLOB. The table is rebuilt from the model definition
+    (SQLite's create/copy/drop/rename procedure) and the rows copied over.
+    """
+    db_path = Path(settings.DATABASE_URL.replace("sqlite:///", ""))
+    print(f"Migrating database at: {db_path}")
+    
+    conn = connect(db_path)
+    
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(calibration_runs)")]
+        if "camera_intrinsics" in columns:
+            print("calibration_runs.camera_intrinsics column already exists")
+            return
+        
+        with transaction(conn) as cursor:
+            count = rebuild_table(
+                cursor, CalibrationRun.__table__, {"camera_intrinsics": (INTRINSIC_FIELDS, pack_intrinsics)}
+            )
+        
+        print(f"Packed camera intrinsics of {count} calibration runs")
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Error migrating database: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
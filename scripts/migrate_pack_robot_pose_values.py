@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import settings
+from backend.models import RobotPose
+from migration_utils import connect, rebuild_table, transaction
+
+POSE_FIELDS = ("x", "y", "z", "rx", "ry", "rz")
+
+
+def pack_pose(values):
+    """Six floats -> 48-byte float64 BLOB."""
+    return np.asarray(values, dtype=np.float64).tobytes()
+
+
+def migrate():
+    """
+    Replace the six x, y, z, rx, ry, rz columns of robot_poses with the packed
+    `pose` BLOB (six float64s). SQLite cannot drop NOT NULL columns in place, so
+    the table is rebuilt from the current model definition and the rows copied over.
+    """
+    db_path = Path(settings.DATABASE_URL.replace("sqlite:///", ""))
+    print(f"Migrating database at: {db_path}")
+    
+    conn = connect(db_path)
+    
+    try:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(robot_poses)")]
+        if "pose" in columns:
+            print("robot_poses.pose column already exists")
+            return
+        
+        with transaction(conn) as cursor:
+            count = rebuild_table(cursor, RobotPose.__table__, {"pose": (POSE_FIELDS, pack_pose)})
+        
+        print(f"Packed {count} robot poses into robot_poses.pose")
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Error migrating database: {e}")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+import sqlite3
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import settings
+from backend.utils.encryption import EncryptionService
+
+ENCRYPTED_COLUMNS = ("mfa_secret", "mfa_code")
+
+def migrate():
+    """
+    Re-encrypt users' MFA values with the HKDF-derived AES key.
+    
+    Values written with the legacy padded SECRET_KEY still decrypt through the
+    service's fallback; re-encrypting them lets that fallback be retired.
+    """
+    db_path = Path(settings.DATABASE_URL.replace("sqlite:///", ""))
+    print(f"Migrating database at: {db_path}")
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        for column in ENCRYPTED_COLUMNS:
+            rows = cursor.execute(
+                f"SELECT id, {column} FROM users WHERE {column} IS NOT NULL"
+            ).fetchall()
+            
+            updates = []
+            for user_id, ciphertext in rows:
+                # Raw BLOB values (migrate_mfa_to_blob.py) or legacy base64 text
+                is_raw = isinstance(ciphertext, bytes)
+                decrypt = EncryptionService.decrypt_bytes if is_raw else EncryptionService.decrypt
+                encrypt = EncryptionService.encrypt_bytes if is_raw else EncryptionService.encrypt
+                plaintext = decrypt(ciphertext)
+                if plaintext is None:
+                    print(f"User {user_id}: {column} could not be decrypted, left unchanged")
+                    continue
+                updates.append((encrypt(plaintext), user_id))
+            
+            cursor.executemany(f"UPDATE users SET {column} = ? WHERE id = ?", updates)
+            print(f"Re-encrypted {len(updates)} {column} values")
+        
+        conn.commit()
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Error migrating database: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
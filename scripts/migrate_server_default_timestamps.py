@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+import sqlite3
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.config import settings
+
+# (table, column) timestamps now generated by the database (server_default=func.now())
+TIMESTAMP_COLUMNS = [
+    ("users", "created_at"),
+    ("algorithm_parameters", "created_at"),
+    ("calibration_runs", "created_at"),
+    ("camera_poses", "computed_at"),
+    ("calibration_images", "uploaded_at"),
+]
+
+
+def migrate():
+    """
+    Add DEFAULT (CURRENT_TIMESTAMP) to timestamp columns of existing tables.
+    
+    SQLite cannot ALTER a column default, so the stored CREATE TABLE statements
+    are edited in place (only the default changes, so table data is untouched).
+    """
+    db_path = Path(settings.DATABASE_URL.replace("sqlite:///", ""))
+    print(f"Migrating database at: {db_path}")
+    
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        schema_version = cursor.execute("PRAGMA schema_version").fetchone()[0]
+        cursor.execute("PRAGMA writable_schema = ON")
+        
+        changed = False
+        for table, column in TIMESTAMP_COLUMNS:
+            row = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            if row is None:
+                print(f"{table} table does not exist, skipping")
+                continue
+            
+            old_definition = f"{column} DATETIME NOT NULL"
+            new_definition = f"{column} DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL"
+            if old_definition not in row[0]:
+                print(f"{table}.{column} already has a default")
+                continue
+            
+            cursor.execute(
+                "UPDATE sqlite_master SET sql = ? WHERE type = 'table' AND name = ?",
+                (row[0].replace(old_definition, new_definition), table)
+            )
+            changed = True
+            print(f"Added server default to {table}.{column}")
+        
+        if changed:
+            # Make other connections reload the edited schema
+            cursor.execute(f"PRAGMA schema_version = {schema_version + 1}")
+        cursor.execute("PRAGMA writable_schema = OFF")
+        
+        conn.commit()
+        
+        integrity = cursor.execute("PRAGMA integrity_check").fetchone()[0]
+        print(f"Integrity check: {integrity}")
+        print("Migration completed successfully!")
+        
+    except Exception as e:
+        print(f"Error migrating database: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,156 @@
+"""
+Shared helpers for the SQLite migration scripts that rebuild tables from the models.
+
+Run order for a database created before the schema changes (every script is
+idempotent, so re-running the whole list is safe):
+
+    python scripts/migrate_matrices_to_blob.py
+    python scripts/migrate_server_default_timestamps.py
+    python scripts/migrate_add_pose_indexes.py
+    python scripts/migrate_add_thumbnail_path.py
+    python scripts/migrate_pack_robot_pose_values.py
+    python scripts/migrate_pack_camera_intrinsics.py
+    python scripts/migrate_enums_to_smallint.py
+    python scripts/migrate_reencrypt_hkdf_key.py
+    python scripts/migrate_mfa_to_blob.py
+
+Every rebuild converts enum names to SMALLINT codes row by row, so the tables
+rebuilt by the packing scripts already come out readable by the models;
+migrate_enums_to_smallint.py handles the rest.
+"""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Sequence, Tuple
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from backend.models.types import IntEnumType
+
+# New column -> (stored source columns, function building its value from them)
+ComputedColumns = Dict[str, Tuple[Sequence[str], Callable]]
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """
+    Open the database in autocommit mode so transactions are explicit.
+
+    Python's sqlite3 otherwise commits DDL outside its implicit transaction, so a
+    failed rebuild could not be rolled back. Foreign keys are disabled for the
+    rebuilds (the pragma has no effect inside a transaction).
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA foreign_keys = OFF")
+    return conn
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection):
+    """BEGIN ... COMMIT, rolling back (DDL included) if the block raises."""
+    conn.execute("BEGIN")
+    try:
+        yield conn.cursor()
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def enum_code_expr(column_name: str, column_type: IntEnumType) -> str:
+    """
+    SQL expression giving the SMALLINT code of a stored enum.
+
+    Decided per row: text values (member names, or values) are mapped to their
+    codes, values that are already integers are kept. Unknown names give NULL,
+    which NOT NULL columns reject, so the transaction fails instead of losing data.
+    """
+    cases = []
+    for member in column_type.enum_class:
+        code = column_type.code_for(member)
+        cases.append(f"WHEN '{member.name}' THEN {code} WHEN '{member.value}' THEN {code}")
+    cases = " ".join(cases)
+    return (
+        f"CASE WHEN typeof({column_name}) = 'text' "
+        f"THEN CASE {column_name} {cases} END ELSE {column_name} END"
+    )
+
+
+def text_enum_columns(cursor: sqlite3.Cursor, table: Table) -> list:
+    """Enum columns of `table` that still hold text values in some row."""
+    return [
+        column for column in table.columns
+        if isinstance(column.type, IntEnumType) and cursor.execute(
+            f"SELECT 1 FROM {table.name} WHERE typeof({column.name}) = 'text' LIMIT 1"
+        ).fetchone()
+    ]
+
+
+def rebuild_table(cursor: sqlite3.Cursor, table: Table, computed: ComputedColumns = None) -> int:
+    """
+    Rebuild `table` from its model definition (SQLite's create/copy/drop/rename procedure).
+
+    Columns the model shares with the stored table are copied, with enum columns
+    converted to SMALLINT codes; `computed` builds the model's new columns in
+    Python from stored ones. Stored columns the model no longer has are dropped.
+    Must run inside transaction() so a failure leaves the table untouched.
+
+    Returns:
+        Number of rows copied
+    """
+    computed = computed or {}
+    stored = {row[1] for row in cursor.execute(f"PRAGMA table_info({table.name})")}
+
+    select_exprs = []
+    for column in table.columns:
+        if column.name in computed:
+            continue
+        if column.name not in stored:
+            raise ValueError(
+                f"{table.name}.{column.name} is missing; run the migrations in the order "
+                f"listed in scripts/migration_utils.py"
+            )
+        if isinstance(column.type, IntEnumType):
+            select_exprs.append(enum_code_expr(column.name, column.type))
+        else:
+            select_exprs.append(column.name)
+
+    copied = [c.name for c in table.columns if c.name not in computed]
+    sources = [name for sources, _ in computed.values() for name in sources]
+    rows = cursor.execute(
+        f"SELECT {', '.join(select_exprs + sources)} FROM {table.name}"
+    ).fetchall()
+
+    n_copied = len(copied)
+    values = []
+    for row in rows:
+        new_row = list(row[:n_copied])
+        offset = n_copied
+        for sources, build in computed.values():
+            new_row.append(build(row[offset:offset + len(sources)]))
+            offset += len(sources)
+        values.append(new_row)
+
+    index_names = [row[0] for row in cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table.name,)
+    )]
+    for name in index_names:
+        cursor.execute(f"DROP INDEX {name}")
+
+    # Leftover of a rebuild interrupted before these migrations ran in transactions
+    cursor.execute(f"DROP TABLE IF EXISTS {table.name}_new")
+    create_sql = str(CreateTable(table).compile(dialect=sqlite.dialect()))
+    cursor.execute(create_sql.replace(f"CREATE TABLE {table.name}", f"CREATE TABLE {table.name}_new", 1))
+    column_names = copied + list(computed)
+    placeholders = ", ".join("?" * len(column_names))
+    cursor.executemany(
+        f"INSERT INTO {table.name}_new ({', '.join(column_names)}) VALUES ({placeholders})",
+        values
+    )
+    cursor.execute(f"DROP TABLE {table.name}")
+    cursor.execute(f"ALTER TABLE {table.name}_new RENAME TO {table.name}")
+    for index in table.indexes:
+        cursor.execute(str(CreateIndex(index).compile(dialect=sqlite.dialect())))
+    return len(values)